@@ -3,13 +3,118 @@ from circleshape import CircleShape
 import random
 from constants import (
     ASTEROID_MIN_RADIUS, ASTEROID_SPLIT_ANGLE_MIN, ASTEROID_SPLIT_ANGLE_MAX, ASTEROID_SPLIT_SPEED_MULT,
-    ASTEROID_LARGE_RADIUS, ASTEROID_MEDIUM_RADIUS, SCREEN_WIDTH, SCREEN_HEIGHT
+    ASTEROID_LARGE_RADIUS, ASTEROID_MEDIUM_RADIUS, SCREEN_WIDTH, SCREEN_HEIGHT,
+    ASTEROID_ROTATION_STEPS, ASTEROID_SPRITE_CACHE_SIZE, ASTEROID_SPRITE_CACHE_MB, ASTEROID_SPAWN_RADII,
+    ASTEROID_OUTLINE_VARIANTS, ASTEROID_OUTLINE_SEED
 )
+from surfcache import SurfaceCache
+from entitystore import KIND_ASTEROID
 import itertools
 
 _id_gen = itertools.count(1)
+_outlines = {}  # radius -> tuple of outlines, see outline_library
+_sprite_cache = SurfaceCache(ASTEROID_SPRITE_CACHE_SIZE, ASTEROID_SPRITE_CACHE_MB * 2**20)  # (radius, shape, rotation step) -> surface
+
+def reserve_ids(highest):
+    # make sure freshly spawned asteroids never reuse an id up to `highest`
+    global _id_gen
+    _id_gen = itertools.count(max(next(_id_gen), highest + 1))
+
+def generate_outline(radius, rng):
+    # build polygons by sampling points around the circle
+    # with jittered radius, points are relative to (0,0).
+
+    # number of vertices
+    n = rng.randint(10, 16)
+
+    # how lumpy it will be
+    min_scale = 0.75   # inner “dents”
+    max_scale = 1.00   # outer “bumps”
+
+    # smoothing so it doesn’t look spiky
+    smooth_strength = 0.35  # 0=no smooth, 1=very smooth
+
+    # base equally spaced angles
+    angles = [ (360.0 / n) * i for i in range(n) ]
+
+    # raw jittered radii
+    raw = [ radius * rng.uniform(min_scale, max_scale) for _ in range(n) ]
+
+    if smooth_strength > 0:
+        smoothed = []
+        for i in range(n):
+            prev_r = raw[(i-1) % n]
+            cur_r  = raw[i]
+            next_r = raw[(i+1) % n]
+            avg = (prev_r + cur_r + next_r) / 3.0
+            r = (1.0 - smooth_strength) * cur_r + smooth_strength * avg
+            smoothed.append(r)
+        radii = smoothed
+    else:
+        radii = raw
+
+    # build relative points around the center
+    pts = []
+    for ang in angles:
+        # +Y for down, -Y for up -> then rotate.
+        v = pygame.Vector2(0, -1).rotate(ang) * radii[len(pts)]
+        pts.append(v)
+    return tuple(pts)
+
+
+def outline_library(radius):
+    # ASTEROID_OUTLINE_VARIANTS fixed outlines per radius, asteroids pick one by index.
+    # own seeded rng, so shapes are the same every run and never touch the round's rng
+    shapes = _outlines.get(radius)
+    if shapes is None:
+        rng = random.Random(f"{ASTEROID_OUTLINE_SEED}:{radius}")
+        shapes = _outlines[radius] = tuple(generate_outline(radius, rng) for _ in range(ASTEROID_OUTLINE_VARIANTS))
+    return shapes
+
+
+def render_frame(radius, outline, step):
+    # padding covers line width, pad to avoid edge clipping
+    line_w = 2
+    pad = line_w + 6
+    size = int(radius * 2) + pad * 2
+    surf = pygame.Surface((size, size), pygame.SRCALPHA)
+
+    cx = (size * 0.5)
+    cy = (size * 0.5)
+
+    # rotate into local coords (keep floats for aalines)
+    angle = step * 360.0 / ASTEROID_ROTATION_STEPS
+    pts_local = [(cx + p.x, cy + p.y) for p in (q.rotate(angle) for q in outline)]
+    # draw filled thin then an aa outline to close tiny gaps
+    pygame.draw.polygon(surf, (255, 255, 255, 0), pts_local, 0)  # no visible fill (alpha 0)
+    pygame.draw.aalines(surf, (255, 255, 255), True, pts_local, 1)
+    pygame.draw.polygon(surf, "white", pts_local, line_w)
+    return surf
+
+
+def prerender_frames(radii=ASTEROID_SPAWN_RADII):
+    # fill the frame cache up front, up to its budget (outline by outline, all
+    # rotation steps each): fewer first-draw hitches, and a long run's memory
+    # is at its ceiling from the start
+    for shape in range(ASTEROID_OUTLINE_VARIANTS):
+        for radius in radii:
+            outline = outline_library(radius)[shape]
+            for step in range(ASTEROID_ROTATION_STEPS):
+                if _sprite_cache.full():
+                    return len(_sprite_cache)
+                _sprite_cache.get((radius, shape, step), lambda: render_frame(radius, outline, step))
+    return len(_sprite_cache)
+
+# spawn sizes up front, anything else (tuning overrides) on first use
+for _radius in ASTEROID_SPAWN_RADII:
+    outline_library(_radius)
+
 
 class Asteroid(CircleShape):
+    store_kind = KIND_ASTEROID
+    rng = random  # per-round random.Random, set like containers
+    families = None  # per-round FamilyIndex, set like containers
+
     def __init__(self, x, y, radius, root_id=None, root_radius=None, parent_id=None, branch_id=None):
         super().__init__(x, y, radius)
         self.id = next(_id_gen)
@@ -30,89 +135,44 @@ class Asteroid(CircleShape):
             self.root_id = root_id
             self.root_radius = root_radius if root_radius is not None else radius
 
+        # live family/branch counts for the scorer
+        self._families = self.families
+        if self._families is not None:
+            self._families.add(self)
+
         # visual state
-        self.rotation = random.uniform(0, 360)
-        self.spin = random.uniform(-25.0, 25.0)
-        self._outline = self._generate_lumpy_outline()
-
-    def _generate_lumpy_outline(self):
-        # build polygons by sampling points around the circle
-        # with jittered radius, points are relative to (0,0).
-
-        # number of vertices
-        n = random.randint(10, 16)
-
-        # how lumpy it will be
-        min_scale = 0.75   # inner “dents”
-        max_scale = 1.00   # outer “bumps”
-
-        # smoothing so it doesn’t look spiky
-        smooth_strength = 0.35  # 0=no smooth, 1=very smooth
-
-        # base equally spaced angles
-        angles = [ (360.0 / n) * i for i in range(n) ]
-
-        # raw jittered radii
-        raw = [ self.radius * random.uniform(min_scale, max_scale) for _ in range(n) ]
-
-        if smooth_strength > 0:
-            smoothed = []
-            for i in range(n):
-                prev_r = raw[(i-1) % n]
-                cur_r  = raw[i]
-                next_r = raw[(i+1) % n]
-                avg = (prev_r + cur_r + next_r) / 3.0
-                r = (1.0 - smooth_strength) * cur_r + smooth_strength * avg
-                smoothed.append(r)
-            radii = smoothed
-        else:
-            radii = raw
+        self.rotation = self.rng.uniform(0, 360)
+        self.spin = self.rng.uniform(-25.0, 25.0)
+        self.shape = self.rng.randrange(len(outline_library(radius)))
 
-        # build relative points around the center
-        pts = []
-        for ang in angles:
-            # +Y for down, -Y for up -> then rotate.
-            v = pygame.Vector2(0, -1).rotate(ang) * radii[len(pts)]
-            pts.append(v)
-        return pts
+    @property
+    def outline(self):
+        return outline_library(self.radius)[self.shape]
 
     def draw(self, screen):
-        W, H = SCREEN_WIDTH, SCREEN_HEIGHT
-
         # do not render until it entered the playfield
         if not self._entered_screen and not self._is_inside_playfield():
-            return
+            return None
 
-        if not hasattr(self, "_outline") or self._outline is None:
-            self._outline = self._generate_lumpy_outline()
+        # nearest pre-rotated frame, rasterized once and kept in the LRU cache
+        step = int(round(self.rotation * ASTEROID_ROTATION_STEPS / 360.0)) % ASTEROID_ROTATION_STEPS
+        # frames are shared by every asteroid with the same radius and shape
+        surf = _sprite_cache.get((self.radius, self.shape, step), lambda: self._render_frame(step))
 
-        # padding covers line width, pad to avoid edge clipping
-        line_w = 2
-        pad = line_w + 6
-        r = self.radius
-        size = int(r * 2) + pad * 2
-        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        half = surf.get_width() * 0.5
+        return screen.blit(surf, (int(self.position.x - half), int(self.position.y - half)))
 
-        cx = (size * 0.5)
-        cy = (size * 0.5)
-
-        # rotate into local coords (keep floats for aalines)
-        pts_local = [pygame.Vector2(cx, cy) + p.rotate(self.rotation) for p in self._outline]
-        # draw filled thin then an aa outline to close tiny gaps
-        pygame.draw.polygon(surf, (255, 255, 255, 0), [(p.x, p.y) for p in pts_local], 0)  # no visible fill (alpha 0)
-        pygame.draw.aalines(surf, (255, 255, 255), True, [(p.x, p.y) for p in pts_local], 1)
-        pygame.draw.polygon(surf, "white", [(p.x, p.y) for p in pts_local], line_w)
-
-        base_x = int(self.position.x - cx)
-        base_y = int(self.position.y - cy)
-
-        screen.blit(surf, (base_x, base_y))
+    def _render_frame(self, step):
+        return render_frame(self.radius, self.outline, step)
 
     def _is_inside_playfield(self):
         return (0 <= self.position.x <= SCREEN_WIDTH and
                 0 <= self.position.y <= SCREEN_HEIGHT)
 
     def update(self, dt):
+        if self._slot is not None:
+            return  # integrated by EntityStore.step
+
         self.integrate(dt)
         if not self._entered_screen and self._is_inside_playfield():
             self._entered_screen = True
@@ -123,6 +183,20 @@ class Asteroid(CircleShape):
 
         self.rotation = (self.rotation + self.spin * dt) % 360.0
 
+    def kill(self):
+        # unregister once, kill() can be called on an already dead sprite
+        if self._families is not None:
+            self._families.remove(self)
+            self._families = None
+        super().kill()
+
+    def start_branch(self):
+        # this asteroid heads its own branch (big -> medium split)
+        if self._families is not None:
+            self._families.set_branch(self, self.id)
+        else:
+            self.branch_id = self.id
+
     def split(self):
         # remove asteroid
         self.kill()
@@ -135,11 +209,11 @@ class Asteroid(CircleShape):
         base_vel = self.velocity
         if base_vel.length_squared() < 1e-6:
             # random nudge if almost stationary
-            angle = random.uniform(0, 360)
+            angle = self.rng.uniform(0, 360)
             base_vel = pygame.Vector2(1, 0).rotate(angle) * 5
 
         # random split angle and two diverging velocities
-        random_angle = random.uniform(ASTEROID_SPLIT_ANGLE_MIN, ASTEROID_SPLIT_ANGLE_MAX)
+        random_angle = self.rng.uniform(ASTEROID_SPLIT_ANGLE_MIN, ASTEROID_SPLIT_ANGLE_MAX)
         v1 = base_vel.rotate(+random_angle) * ASTEROID_SPLIT_SPEED_MULT 
         v2 = base_vel.rotate(-random_angle) * ASTEROID_SPLIT_SPEED_MULT
 
@@ -149,26 +223,26 @@ class Asteroid(CircleShape):
         # branch assignment for children
         if self.radius >= ASTEROID_LARGE_RADIUS and new_radius == ASTEROID_MEDIUM_RADIUS:
             # BIG -> MEDIUM: start two new branches, each medium is the head of its branch
-            a1 = Asteroid(self.position.x, self.position.y, new_radius,
-                          root_id=self.root_id, root_radius=self.root_radius,
-                          parent_id=self.id, branch_id=None)  # temp None
-            a1.branch_id = a1.id  # its own branch id
+            a1 = Asteroid.create(self.position.x, self.position.y, new_radius,
+                                 root_id=self.root_id, root_radius=self.root_radius,
+                                 parent_id=self.id, branch_id=None)  # temp None
+            a1.start_branch()  # its own branch id
             a1.velocity = v1
 
-            a2 = Asteroid(self.position.x, self.position.y, new_radius,
-                          root_id=self.root_id, root_radius=self.root_radius,
-                          parent_id=self.id, branch_id=None)
-            a2.branch_id = a2.id
+            a2 = Asteroid.create(self.position.x, self.position.y, new_radius,
+                                 root_id=self.root_id, root_radius=self.root_radius,
+                                 parent_id=self.id, branch_id=None)
+            a2.start_branch()
             a2.velocity = v2
 
         else:
             # MEDIUM -> SMALL: inherit branch from parent
-            a1 = Asteroid(self.position.x, self.position.y, new_radius,
-                          root_id=self.root_id, root_radius=self.root_radius,
-                          parent_id=self.id, branch_id=self.branch_id)
+            a1 = Asteroid.create(self.position.x, self.position.y, new_radius,
+                                 root_id=self.root_id, root_radius=self.root_radius,
+                                 parent_id=self.id, branch_id=self.branch_id)
             a1.velocity = v1
 
-            a2 = Asteroid(self.position.x, self.position.y, new_radius,
-                          root_id=self.root_id, root_radius=self.root_radius,
-                          parent_id=self.id, branch_id=self.branch_id)
+            a2 = Asteroid.create(self.position.x, self.position.y, new_radius,
+                                 root_id=self.root_id, root_radius=self.root_radius,
+                                 parent_id=self.id, branch_id=self.branch_id)
             a2.velocity = v2
@@ -5,6 +5,8 @@ from constants import *
 
 
 class AsteroidField(pygame.sprite.Sprite):
+    rng = random  # per-round random.Random, set like containers
+
     # each entry - inward dir, spawn_position_fn(t, radius), -y up, +y down
     edges = [
         # spawn left side, off screen, going +- right
@@ -25,7 +27,7 @@ class AsteroidField(pygame.sprite.Sprite):
         self.spawn_timer = 0.0
 
     def spawn(self, radius, position, velocity):
-        asteroid = Asteroid(position.x, position.y, radius, root_id=None, root_radius=radius)
+        asteroid = Asteroid.create(position.x, position.y, radius, root_id=None, root_radius=radius)
         asteroid.velocity = velocity
 
     @staticmethod
@@ -39,19 +41,19 @@ class AsteroidField(pygame.sprite.Sprite):
             self.spawn_timer -= ASTEROID_SPAWN_RATE
 
             # choose size for offscreen placement
-            radius = random.choice(ASTEROID_SPAWN_RADII)
+            radius = self.rng.choice(ASTEROID_SPAWN_RADII)
 
             # pick an edge & inward direction
-            inward, pos_fn = random.choice(self.edges)
+            inward, pos_fn = self.rng.choice(self.edges)
 
             # pick velocity mostly inward (+- jitter)
-            speed = random.uniform(ASTEROID_SPAWN_SPEED_MIN, ASTEROID_SPAWN_SPEED_MAX)
-            angle_jitter = random.uniform(-ASTEROID_SPAWN_ANGLE_JITTER, ASTEROID_SPAWN_ANGLE_JITTER)
+            speed = self.rng.uniform(ASTEROID_SPAWN_SPEED_MIN, ASTEROID_SPAWN_SPEED_MAX)
+            angle_jitter = self.rng.uniform(-ASTEROID_SPAWN_ANGLE_JITTER, ASTEROID_SPAWN_ANGLE_JITTER)
             direction = inward.rotate(angle_jitter)
             velocity = direction * speed
 
             # position along that edge
-            t = random.uniform(0.0, 1.0)
+            t = self.rng.uniform(0.0, 1.0)
             position = pos_fn(t, radius)
 
             # guarantee for offscreen spawn
@@ -0,0 +1,250 @@
+import heapq
+import math
+from collections import deque
+import controls
+from circleshape import wrapped_delta
+from constants import (SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_RADIUS, PLAYER_SPEED, PLAYER_TURN_SPEED,
+                       PLAYER_SHOOT_SPEED, AUTOPILOT_BUDGET_MS, AUTOPILOT_HORIZON, AUTOPILOT_SAMPLES,
+                       AUTOPILOT_MAX_THREATS, AUTOPILOT_SAFE_MARGIN, AUTOPILOT_AIM_TOLERANCE, AUTOPILOT_WINDOW)
+from profiler import perf_ns, percentile
+
+# maneuvers tried when the plan is unsafe, in order: (heading offset from now in deg, thrust)
+# thrust: 1 forward, -1 reverse, 0 coast. cheap to execute first, so a cut-off search
+# still has the likely ones.
+MANEUVERS = (
+    (0, 1), (90, 1), (-90, 1), (45, 1), (-45, 1), (180, 1), (135, 1), (-135, 1), (0, -1), (0, 0),
+)
+SCAN_CHECK_EVERY = 32  # asteroids scanned between deadline checks
+
+
+def wrap(v, size, radius):
+    # same as CircleShape.wrap_position, applied to a predicted coordinate
+    return (v + radius) % (size + 2 * radius) - radius
+
+
+def heading_to(dx, dy):
+    # Player.rotation that points forward (0, 1) along (dx, dy)
+    return math.degrees(math.atan2(-dx, dy))
+
+
+def angle_diff(a, b):
+    # signed a - b in -180..180
+    return (a - b + 180.0) % 360.0 - 180.0
+
+
+def lead_time(dx, dy, vx, vy, speed):
+    # earliest t with |d + v t| = speed * t (shots don't inherit the ship's velocity)
+    a = vx * vx + vy * vy - speed * speed
+    b = 2 * (dx * vx + dy * vy)
+    c = dx * dx + dy * dy
+    if abs(a) < 1e-9:
+        return -c / b if b < 0 else None
+    disc = b * b - 4 * a * c
+    if disc < 0:
+        return None
+    root = math.sqrt(disc)
+    times = [t for t in ((-b - root) / (2 * a), (-b + root) / (2 * a)) if t > 0]
+    return min(times) if times else None
+
+
+class Autopilot:
+    # plays the Player for soak runs and demos: policy(world) -> controls mask,
+    # same shape as the headless policies.
+    # each tick is an anytime search under budget_ms:
+    #   scan     nearest asteroids (wrap-aware), round-robin when cut short
+    #   predict  their wrapped positions over `horizon` from velocity
+    #   plan     goal = nearest powerup, else lead-aim the nearest asteroid;
+    #            if the goal path gets closer than AUTOPILOT_SAFE_MARGIN to a
+    #            predicted asteroid, try MANEUVERS until the budget runs out and
+    #            keep the one with the most clearance
+    # more asteroids -> fewer maneuvers / a partial scan, never a longer tick.
+    # budget_ms=None: no deadline, decisions depend only on the world (deterministic).
+    # decision cost: world.profiler gets an "autopilot" lap, stats() has percentiles.
+
+    def __init__(self, budget_ms=AUTOPILOT_BUDGET_MS, horizon=None, samples=None, max_threats=None):
+        self.budget_ns = None if budget_ms is None else int(budget_ms * 1e6)
+        self.horizon = AUTOPILOT_HORIZON if horizon is None else horizon
+        self.samples = AUTOPILOT_SAMPLES if samples is None else samples
+        self.max_threats = AUTOPILOT_MAX_THREATS if max_threats is None else max_threats
+        self.cursor = 0           # scan start, moves on when a scan is cut short
+        # instrumentation
+        self.costs = deque(maxlen=AUTOPILOT_WINDOW)  # ns per decision
+        self.decisions = 0
+        self.timeouts = 0         # decisions that hit the deadline
+        self.partial_scans = 0
+        self.evaluated = 0        # maneuvers simulated, all decisions
+        self.dodges = 0           # decisions that left the goal plan
+
+    def __call__(self, world):
+        start = perf_ns()
+        deadline = None if self.budget_ns is None else start + self.budget_ns
+        mask = self.decide(world, deadline)
+        self.costs.append(perf_ns() - start)
+        self.decisions += 1
+        if world.profiler is not None:
+            world.profiler.lap("autopilot")
+        return mask
+
+    def reset(self):
+        self.cursor = 0
+
+    # search
+    def decide(self, world, deadline):
+        p = world.player
+        px, py = p.position.x, p.position.y
+        # the scan may use half the budget, prediction and the goal check need the rest
+        scan_deadline = None if deadline is None else deadline - self.budget_ns // 2
+        nearest = self.scan(world.asteroids, px, py, scan_deadline)
+        threats = self.predict(nearest)
+
+        goal_heading, goal_thrust, fire = self.goal(world, p, px, py, nearest)
+        plan = (goal_heading, goal_thrust)
+        if not p.is_overcharged() and threats:  # overcharged ships smash through
+            clearance = self.clearance(p, goal_heading, goal_thrust, threats)
+            self.evaluated += 1
+            if clearance < AUTOPILOT_SAFE_MARGIN:
+                self.dodges += 1
+                for offset, thrust in MANEUVERS:
+                    if deadline is not None and perf_ns() >= deadline:
+                        self.timeouts += 1
+                        break
+                    heading = p.rotation + offset
+                    c = self.clearance(p, heading, thrust, threats)
+                    self.evaluated += 1
+                    if c > clearance:
+                        plan, clearance = (heading, thrust), c
+                        if c >= AUTOPILOT_SAFE_MARGIN:
+                            break
+
+        heading, thrust = plan
+        mask = self.steer(p.rotation, heading)
+        if thrust > 0:
+            mask |= controls.THRUST
+        elif thrust < 0:
+            mask |= controls.REVERSE
+        if fire:
+            mask |= controls.FIRE
+        return mask
+
+    def scan(self, asteroids, px, py, deadline):
+        # nearest max_threats asteroids as (gap, dx, dy, asteroid), gap = distance minus radius.
+        # a scan that hits the deadline resumes from there next tick.
+        sprites = asteroids.sprites()
+        n = len(sprites)
+        if n == 0:
+            return []
+        start = self.cursor % n
+        found = []
+        for i in range(n):
+            if deadline is not None and i % SCAN_CHECK_EVERY == SCAN_CHECK_EVERY - 1 and perf_ns() >= deadline:
+                self.cursor = start + i
+                self.partial_scans += 1
+                break
+            a = sprites[(start + i) % n]
+            pos = a.position
+            dx = wrapped_delta(pos.x - px, SCREEN_WIDTH)
+            dy = wrapped_delta(pos.y - py, SCREEN_HEIGHT)
+            found.append((math.hypot(dx, dy) - a.radius, dx, dy, a))
+        return heapq.nsmallest(self.max_threats, found, key=lambda e: e[0])
+
+    def predict(self, nearest):
+        # per threat: radius and its position at each sample time.
+        # asteroids that entered the screen wrap like CircleShape.wrap_position.
+        h = self.horizon / self.samples
+        threats = []
+        for _, _, _, a in nearest:
+            pos, vel, r = a.position, a.velocity, a.radius
+            path = []
+            for i in range(1, self.samples + 1):
+                x = pos.x + vel.x * h * i
+                y = pos.y + vel.y * h * i
+                if a._entered_screen:
+                    x, y = wrap(x, SCREEN_WIDTH, r), wrap(y, SCREEN_HEIGHT, r)
+                path.append((x, y))
+            threats.append((r, path))
+        return threats
+
+    def clearance(self, p, heading, thrust, threats):
+        # smallest gap between the ship and any threat while flying the maneuver:
+        # turn toward `heading`, thrust the whole horizon
+        h = self.horizon / self.samples
+        x, y = p.position.x, p.position.y
+        vx, vy = p.velocity.x, p.velocity.y
+        rot = p.rotation
+        turn = PLAYER_TURN_SPEED * h
+        accel = PLAYER_SPEED if thrust > 0 else -0.5 * PLAYER_SPEED if thrust < 0 else 0.0
+        radius = p.collision_radius()
+        best = math.inf
+        for i in range(self.samples):
+            rot += max(-turn, min(turn, angle_diff(heading, rot)))
+            rad = math.radians(rot)
+            fx, fy = -math.sin(rad), math.cos(rad)
+            if p.is_control_boosted():
+                sign = (accel > 0) - (accel < 0)
+                vx, vy = fx * PLAYER_SPEED * sign, fy * PLAYER_SPEED * sign
+            else:
+                vx += fx * accel * h
+                vy += fy * accel * h
+            x = wrap(x + vx * h, SCREEN_WIDTH, PLAYER_RADIUS)
+            y = wrap(y + vy * h, SCREEN_HEIGHT, PLAYER_RADIUS)
+            for r, path in threats:
+                ax, ay = path[i]
+                gap = math.hypot(wrapped_delta(ax - x, SCREEN_WIDTH), wrapped_delta(ay - y, SCREEN_HEIGHT)) - r - radius
+                if gap < best:
+                    best = gap
+        return best
+
+    def goal(self, world, p, px, py, nearest):
+        # (heading, thrust, fire) when nothing is in the way:
+        # fly to the nearest powerup, otherwise turn on the nearest asteroid and shoot
+        target = None
+        for pw in world.powerups:
+            dx = wrapped_delta(pw.position.x - px, SCREEN_WIDTH)
+            dy = wrapped_delta(pw.position.y - py, SCREEN_HEIGHT)
+            d2 = dx * dx + dy * dy
+            if target is None or d2 < target[0]:
+                target = (d2, dx, dy)
+
+        aim = None
+        for _, dx, dy, a in nearest:
+            if not a._entered_screen:
+                continue
+            vel = a.velocity
+            t = lead_time(dx, dy, vel.x, vel.y, PLAYER_SHOOT_SPEED)
+            if t is not None:
+                aim = heading_to(dx + vel.x * t, dy + vel.y * t)
+            else:
+                aim = heading_to(dx, dy)
+            break
+
+        fire = aim is not None and abs(angle_diff(aim, p.rotation)) <= AUTOPILOT_AIM_TOLERANCE
+        if target is not None:
+            _, dx, dy = target
+            heading = heading_to(dx, dy)
+            return heading, 1 if abs(angle_diff(heading, p.rotation)) < 30 else 0, fire
+        if aim is not None:
+            return aim, 0, fire
+        return p.rotation, 0, False
+
+    @staticmethod
+    def steer(rotation, heading):
+        # LEFT lowers rotation, RIGHT raises it; hold still once within one tick of turning
+        diff = angle_diff(heading, rotation)
+        if abs(diff) <= AUTOPILOT_AIM_TOLERANCE / 2:
+            return controls.NONE
+        return controls.RIGHT if diff > 0 else controls.LEFT
+
+    # instrumentation
+    def stats(self):
+        costs = sorted(self.costs)
+        p50, p99 = (percentile(costs, q) / 1e6 for q in (50, 99))
+        return {
+            "decisions": self.decisions,
+            "cost_p50_ms": p50,
+            "cost_p99_ms": p99,
+            "cost_max_ms": (costs[-1] / 1e6) if costs else 0.0,
+            "timeouts": self.timeouts,
+            "partial_scans": self.partial_scans,
+            "maneuvers_per_decision": self.evaluated / max(1, self.decisions),
+            "dodges": self.dodges,
+        }
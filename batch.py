@@ -0,0 +1,112 @@
+import os
+# workers never open a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import ast
+import itertools
+import json
+import multiprocessing
+import statistics
+import time
+import constants
+import tuning
+from constants import HEADLESS_DT, HEADLESS_MAX_TIME
+from headless import POLICIES, run_round
+
+
+def parse_sweep(assignments):
+    # ["NAME=1,2", "OTHER=0.5", "RADII=(10,20),(15,30)"] -> list of override dicts (cartesian product).
+    # the right-hand side is one python literal, a tuple of values sweeps them.
+    # a constant that holds a tuple/list takes "NAME=(1,2)" as one value.
+    axes = []
+    for item in assignments:
+        name, _, values = item.partition("=")
+        name = name.strip()
+        if not values.strip():
+            raise ValueError(f"expected NAME=value[,value...], got {item!r}")
+        try:
+            values = ast.literal_eval(values.strip())
+        except (ValueError, SyntaxError):
+            raise ValueError(f"{name}: not a python literal: {values.strip()!r}") from None
+        default = getattr(constants, name, None)
+        if not isinstance(values, tuple) or (isinstance(default, (tuple, list)) and
+                                             not any(isinstance(v, (tuple, list)) for v in values)):
+            values = (values,)
+        axes.append([(name, v) for v in values])
+    configs = [dict(combo) for combo in itertools.product(*axes)]
+    for config in configs:
+        tuning.validate(config)
+    return configs
+
+
+def run_job(job):
+    # worker side: one seeded round with its own overrides,
+    # active before the policy is built so it sees them too
+    tuning.activate(job["overrides"])
+    policy = POLICIES[job["policy"]](job["seed"])
+    stats = run_round(policy, job["dt"], job["max_time"], job["overrides"], seed=job["seed"])
+    stats["config"] = job["config"]
+    return stats
+
+
+def summarize(results):
+    times = [r["time"] for r in results]
+    scores = [r["score"] for r in results]
+    kills = {size: sum(r["kills"][size] for r in results) / len(results) for size in ("large", "medium", "small")}
+    return {
+        "rounds": len(results),
+        "time_mean": statistics.fmean(times),
+        "time_median": statistics.median(times),
+        "score_mean": statistics.fmean(scores),
+        "score_max": max(scores),
+        "kills_mean": kills,
+        "chain_bonuses_mean": statistics.fmean(r["chain_bonuses"] for r in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="seeded headless rounds on all cores, with constant sweeps")
+    parser.add_argument("--rounds", type=int, default=100, help="rounds per config")
+    parser.add_argument("--set", dest="sweep", action="append", default=[],
+                        metavar="NAME=V1,V2", help="override a constant, several values = sweep")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dt", type=float, default=None,
+                        help=f"sec per tick, default HEADLESS_DT ({HEADLESS_DT}, sweepable)")
+    parser.add_argument("--max-time", type=float, default=None,
+                        help=f"round time cap in sec, default HEADLESS_MAX_TIME ({HEADLESS_MAX_TIME}, sweepable)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="batch_results.jsonl")
+    args = parser.parse_args()
+
+    configs = parse_sweep(args.sweep) or [{}]
+    # same seeds for every config, so configs are compared on identical rounds
+    jobs = [
+        {"config": c, "overrides": overrides, "seed": args.seed + i, "policy": args.policy,
+         "dt": args.dt, "max_time": args.max_time}
+        for c, overrides in enumerate(configs)
+        for i in range(args.rounds)
+    ]
+
+    results = {c: [] for c in range(len(configs))}
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.workers) as pool, open(args.out, "w", encoding="utf-8") as out:
+        # stream rows as they finish, one compact json object per line
+        for stats in pool.imap_unordered(run_job, jobs, chunksize=max(1, len(jobs) // (args.workers * 8))):
+            results[stats["config"]].append(stats)
+            out.write(json.dumps(stats, separators=(",", ":")) + "\n")
+        for c, overrides in enumerate(configs):
+            summary = {"summary": c, "overrides": overrides, **summarize(results[c])}
+            out.write(json.dumps(summary, separators=(",", ":")) + "\n")
+            print(f"config {c} {overrides or '(defaults)'}: "
+                  f"time {summary['time_mean']:.1f}s  score {summary['score_mean']:.0f}  "
+                  f"chains {summary['chain_bonuses_mean']:.2f}")
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(jobs)} rounds in {elapsed:.1f}s on {args.workers} workers -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
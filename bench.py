@@ -0,0 +1,177 @@
+import os
+# benchmarks run on headless CI boxes
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import pygame
+import world as world_mod
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, ASTEROID_SPAWN_RADII, PLAYER_SHOOT_SPEED, SIM_DT, \
+    SHIELD_DASH_LEN, SHIELD_GAP_LEN, SHIELD_LINE_WIDTH, SHIELD_COLOR
+from asteroid import Asteroid
+from shot import Shot
+from world import World
+
+# synthetic worlds at fixed scales, timed per hot path.
+# every benchmark gets a fresh seeded world per repeat, so runs are comparable
+# across commits; results go to json for diffing with --compare.
+
+
+def build_world(n_asteroids, n_shots, seed=1):
+    world = World(seed=seed)
+    rng = random.Random(seed)
+    # keep the player out of the way so nothing ends the round early
+    world.player.position.update(-10000, -10000)
+    for _ in range(n_asteroids):
+        radius = rng.choice(ASTEROID_SPAWN_RADII)
+        a = Asteroid(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), radius)
+        a.velocity = pygame.Vector2(rng.uniform(-120, 120), rng.uniform(-120, 120))
+        a._entered_screen = True
+    for _ in range(n_shots):
+        s = Shot(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT))
+        s.velocity = pygame.Vector2(0, PLAYER_SHOOT_SPEED).rotate(rng.uniform(0, 360))
+        s.prev_position = s.position - s.velocity * SIM_DT
+    return world
+
+
+def timed(setup, run, repeats):
+    # setup() -> state (untimed), run(state) timed once per repeat
+    samples = []
+    for _ in range(repeats):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        samples.append(time.perf_counter() - start)
+        if isinstance(state, World):
+            state.clear()
+    return samples
+
+
+def bench_cases(n_asteroids, n_shots, max_brute_pairs):
+    # name -> (setup, run)
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    make = lambda: build_world(n_asteroids, n_shots)
+
+    def collide(use_grid, use_kernel):
+        def run(w):
+            world_mod.collide_shots_asteroids(w.player, w.asteroids, w.shots, w.scorer, w.time,
+                                              use_grid=use_grid, use_kernel=use_kernel, store=w.store)
+        return run
+
+    def bomb(w):
+        grid = world_mod.SpatialGrid.from_sprites(w.asteroids, store=w.store)
+        world_mod.apply_bomb(w.player, w.asteroids, w.scorer,
+                             center=pygame.Vector2(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2), grid=grid)
+
+    def score_all(w):
+        for a in list(w.asteroids):
+            a.kill()
+            w.scorer.asteroid_destroyed(a, w.asteroids, w.time)
+
+    def draw(w):
+        for a in w.asteroids:
+            a.draw(screen)
+
+    def dashed(w):
+        p = w.player
+        for _ in range(1000):
+            p._draw_dashed_circle(screen, pygame.Vector2(640, 360), p.shield_radius(),
+                                  SHIELD_DASH_LEN, SHIELD_GAP_LEN, SHIELD_LINE_WIDTH, SHIELD_COLOR)
+
+    def step(w):
+        for _ in range(10):
+            w.step(SIM_DT, 0)
+
+    cases = {
+        "group_update": (make, lambda w: w.updatable.update(SIM_DT)),
+        "collide_grid": (make, collide(True, False)),
+        "apply_bomb": (make, bomb),
+        "score_destroy_all": (make, score_all),
+        "asteroid_draw": (make, draw),
+        "dashed_circle_x1000": (make, dashed),
+        "world_step_x10": (make, step),
+    }
+    if world_mod.HAVE_NUMPY:
+        cases["collide_kernel"] = (make, collide(False, True))
+    if n_asteroids * n_shots <= max_brute_pairs:
+        cases["collide_brute"] = (make, collide(False, False))
+    return cases
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return {(r["name"], r["asteroids"], r["shots"]): r for r in json.load(f)["results"]}
+
+
+def compare(old_path, old, results):
+    print(f"\nvs {old_path} (median, >1.00 = slower now)")
+    for r in results:
+        prev = old.get((r["name"], r["asteroids"], r["shots"]))
+        if prev and prev["median"] > 0:
+            print(f"  {r['name']:<22} a={r['asteroids']:<5} s={r['shots']:<5} {r['median'] / prev['median']:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="time simulation and rendering hot paths")
+    parser.add_argument("--asteroids", default="50,500,5000")
+    parser.add_argument("--shots", default="10,1000")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--only", action="append", default=[], help="run just these benchmark names")
+    parser.add_argument("--max-brute-pairs", type=int, default=500_000)
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", metavar="OLD_JSON")
+    args = parser.parse_args()
+    # read the baseline first, --out may point at the same file
+    baseline = load_results(args.compare) if args.compare else None
+
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))  # display format for convert_alpha in the sprite caches
+
+    results = []
+    for n_a in (int(v) for v in args.asteroids.split(",")):
+        for n_s in (int(v) for v in args.shots.split(",")):
+            for name, (setup, run) in bench_cases(n_a, n_s, args.max_brute_pairs).items():
+                if args.only and name not in args.only:
+                    continue
+                samples = timed(setup, run, args.repeats)
+                row = {
+                    "name": name, "asteroids": n_a, "shots": n_s, "repeats": len(samples),
+                    "median": statistics.median(samples), "mean": statistics.fmean(samples),
+                    "min": min(samples), "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+                }
+                results.append(row)
+                print(f"{name:<22} a={n_a:<5} s={n_s:<5} median {row['median'] * 1e3:9.3f} ms  "
+                      f"min {row['min'] * 1e3:9.3f} ms")
+
+    meta = {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "pygame": pygame.version.ver,
+        "numpy": getattr(world_mod.collisions.np, "__version__", None),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    print(f"-> {args.out}")
+    if baseline is not None:
+        compare(args.compare, baseline, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,54 @@
 import pygame
 from constants import SCREEN_HEIGHT, SCREEN_WIDTH
 
+
+def wrapped_delta(d, size):
+    # shortest signed distance on a wrapping axis
+    return (d + size / 2) % size - size / 2
+
+
 # Base class for game objects
 class CircleShape(pygame.sprite.Sprite):
+    # optional EntityStore (set like containers), store_kind says which rows we own
+    store = None
+    store_kind = 0
+    # optional Pool (set like containers), killed instances go back to it
+    pool = None
+
     def __init__(self, x, y, radius):
+        # also re-run on recycled instances (see create), so it must reset all state
         # subclasses auto-add to groups with use of containers
         if hasattr(self, "containers"):
             super().__init__(self.containers)
         else:
             super().__init__()
 
-        self.position = pygame.Vector2(x, y)
-        self.velocity = pygame.Vector2(0, 0)
+        # array-backed state: attributes below become views into the store
+        self._store = self.store
+        self._slot = self.store.allocate(self, self.store_kind) if self.store is not None else None
+        self._pool = self.pool
+
+        self._reset_vector("position", x, y)
+        self._reset_vector("velocity", 0, 0)
         self.radius = radius
 
+    @classmethod
+    def create(cls, *args, **kwargs):
+        # constructor that reuses a killed instance from the pool when one is free
+        obj = cls.pool.acquire() if cls.pool is not None else None
+        if obj is None:
+            return cls(*args, **kwargs)
+        obj.__init__(*args, **kwargs)
+        return obj
+
+    def _reset_vector(self, name, x, y):
+        # recycled instances keep their Vector2s, store-backed ones write the row
+        v = self.__dict__.get(name) if self._slot is None else None
+        if v is None:
+            setattr(self, name, pygame.Vector2(x, y))
+        else:
+            v.update(x, y)
+
     # helpers
     def integrate(self, dt: float) -> None:
         # euler integration
@@ -34,9 +69,19 @@ class CircleShape(pygame.sprite.Sprite):
         elif self.position.y > SCREEN_HEIGHT + self.radius:
             self.position.y = -self.radius
 
+    def kill(self):
+        # give the store row back, values stay readable on the dead sprite
+        if self._slot is not None:
+            self._store.release(self)
+        super().kill()
+        # once, kill() can be called on an already dead sprite
+        if self._pool is not None:
+            self._pool.release(self)
+            self._pool = None
+
     # implemented by subclasses
     def draw(self, screen):
-        # sub-classes must override
+        # sub-classes must override, return the painted Rect (or None)
         pass
 
     def update(self, dt):
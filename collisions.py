@@ -0,0 +1,89 @@
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:  # optional, main falls back to per-pair segment_hits_circle
+    np = None
+    HAVE_NUMPY = False
+
+# pairs tested per numpy pass, keeps temporaries bounded (~ a few MB)
+KERNEL_CHUNK_PAIRS = 1 << 18
+
+
+def segment_circle_hits(p0, p1, shot_radii, centers, radii):
+    # batched segment_hits_circle.
+    # p0, p1: (S, 2) shot segments, shot_radii: (S,)
+    # centers: (A, 2), radii: (A,)
+    # returns (asteroid_idx, shot_idx) of every overlapping pair, asteroid-major
+    # and shot order inside each asteroid (same order the python loops visit).
+    n_a, n_s = len(centers), len(p0)
+    if n_a == 0 or n_s == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+
+    v = p1 - p0                                   # (S, 2)
+    v_len2 = v[:, 0] * v[:, 0] + v[:, 1] * v[:, 1]
+    moving = v_len2 != 0
+    safe_len2 = np.where(moving, v_len2, 1.0)
+
+    hit_a, hit_s = [], []
+    rows = max(1, KERNEL_CHUNK_PAIRS // n_s)
+    for start in range(0, n_a, rows):
+        c = centers[start:start + rows]
+        wx = c[:, 0:1] - p0[:, 0]                 # (rows, S)
+        wy = c[:, 1:2] - p0[:, 1]
+        t = (wx * v[:, 0] + wy * v[:, 1]) / safe_len2
+        t = np.clip(t, 0.0, 1.0)
+        t[:, ~moving] = 0.0                       # zero-length segment -> point test at p0
+        # center - (p0 + v * t)
+        dx = c[:, 0:1] - (p0[:, 0] + v[:, 0] * t)
+        dy = c[:, 1:2] - (p0[:, 1] + v[:, 1] * t)
+        r_sum = radii[start:start + rows, None] + shot_radii
+        a_idx, s_idx = np.nonzero(dx * dx + dy * dy <= r_sum * r_sum)
+        hit_a.append(a_idx + start)
+        hit_s.append(s_idx)
+
+    return np.concatenate(hit_a), np.concatenate(hit_s)
+
+
+def within_any(points, centers, radius):
+    # (N,) mask: point inside at least one circle of `radius` around `centers` (B, 2)
+    if len(points) == 0 or len(centers) == 0:
+        return np.zeros(len(points), dtype=bool)
+    dx = points[:, 0:1] - centers[:, 0]
+    dy = points[:, 1:2] - centers[:, 1]
+    return np.any(dx * dx + dy * dy <= radius * radius, axis=1)
+
+
+def first_hits(asteroid_idx, shot_idx):
+    # resolve candidate pairs like the sequential loop does: each asteroid takes
+    # the first still-unused shot that hits it, a shot is consumed by one asteroid.
+    pairs = []
+    used = set()
+    last = -1
+    for a, s in zip(asteroid_idx.tolist(), shot_idx.tolist()):
+        if a == last or s in used:
+            continue
+        used.add(s)
+        last = a
+        pairs.append((a, s))
+    return pairs
+
+
+def gather_segments(shots, store=None):
+    # shot arrays in group order, straight from the store rows when available
+    if store is not None:
+        slots = [s._slot for s in shots]
+        return store.prev[slots], store.pos[slots], store.radius[slots]
+    p0 = np.array([(s.prev_position.x, s.prev_position.y) for s in shots], dtype=np.float64).reshape(-1, 2)
+    p1 = np.array([(s.position.x, s.position.y) for s in shots], dtype=np.float64).reshape(-1, 2)
+    r = np.array([s.radius for s in shots], dtype=np.float64)
+    return p0, p1, r
+
+
+def gather_circles(sprites, store=None):
+    if store is not None:
+        slots = [s._slot for s in sprites]
+        return store.pos[slots], store.radius[slots]
+    c = np.array([(s.position.x, s.position.y) for s in sprites], dtype=np.float64).reshape(-1, 2)
+    r = np.array([s.radius for s in sprites], dtype=np.float64)
+    return c, r
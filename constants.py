@@ -37,12 +37,22 @@ POINTS_LARGE  = 15
 POINTS_MEDIUM = 25
 POINTS_SMALL  = 35
 CHAIN_BONUS   = 50 # bonus when you destroy whole asteroid chain from bigest to smallest in 10 sec
+CHAIN_TIME_LIMIT = 10.0 # sec from first kill in a family to clearing it
 
 # leaderboard & ui
 HIGHSCORES_PATH = "highscores.json"
+LEADERBOARD_COMPACT_EVERY = 500         # logged submissions before the snapshot is rewritten
+LEADERBOARD_BACKGROUND_IO = True        # load and write scores on a background thread
+LEADERBOARD_FSYNC = "always"            # "always" after every write, "interval" at most every
+                                        # LEADERBOARD_FSYNC_INTERVAL sec, "never" (only on close)
+LEADERBOARD_FSYNC_INTERVAL = 5.0        # sec
 UI_FONT_NAME    = "Courier New"     # or None to use default
 UI_FONT_SIZE    = 18
 
+# input
+INPUT_PAD_DEADZONE = 0.35               # gamepad stick travel ignored around center (0..1)
+INPUT_LATENCY_WINDOW = 600              # press -> frame latencies kept for stats
+
 # shots
 SHOT_LIFETIME = 2
 DESPAWN_MARGIN = 50
@@ -67,3 +77,91 @@ POWERUP_CONTROL_DURATION = 15.0         # driftless flight time in sec
 POWERUP_OVERCHARGE_DURATION = 10.0      # invulnerable + smash asteroids in sec
 POWERUP_OVERCHARGE_SLOW = 0.66          # speed multiplier per hit while overcharged
 POWERUP_OVERCHARGE_RADIUS_MULT = 2.0    # how much bigger than normal shield radius
+
+# collisions
+SPATIAL_GRID_ENABLED = True             # False = no broad phase, + SHOT_KERNEL_ENABLED False = plain pairwise loops (reference)
+SPATIAL_CELL_SIZE = ASTEROID_MAX_RADIUS # grid cell size in px
+SHOT_KERNEL_ENABLED = True              # batched numpy passes: shots vs asteroids, bombs without the grid (needs numpy)
+SHOT_KERNEL_MAX_PAIRS = 200_000         # asteroids * shots above this use the grid, the kernel is O(A*S)
+
+# rendering caches
+ASTEROID_ROTATION_STEPS = 64            # pre-rotated frames per asteroid outline
+ASTEROID_SPRITE_CACHE_SIZE = 4096       # max cached frames (LRU)
+ASTEROID_SPRITE_CACHE_MB = 24           # and max cached pixels. a frame is 12-74 KB (radius 20-60), all
+                                        # 3 radii * 16 outlines * 64 steps would be ~120 MB, 24 MB holds ~600
+ASTEROID_OUTLINE_VARIANTS = 16          # precomputed outlines per radius
+ASTEROID_OUTLINE_SEED = 1979            # outline library seed, same shapes every run
+
+# entity storage
+ENTITY_STORE_ENABLED = False            # numpy struct-of-arrays for asteroids/shots (needs numpy)
+
+# simulation
+SIM_TICK_RATE = 60                      # fixed simulation steps per sec
+SIM_DT = 1 / SIM_TICK_RATE
+SIM_MAX_STEPS_PER_FRAME = 8             # catch-up cap, a longer stall is dropped instead of replayed at once
+
+# display
+DISPLAY_FPS = 120                       # render frame cap, 0 = uncapped (simulation rate is SIM_TICK_RATE)
+RENDER_INTERPOLATION = True             # draw between the last two simulation steps
+DISPLAY_VSYNC = False                   # wait for vblank on flip (uses a SCALED window), set DISPLAY_FPS
+                                        # to the monitor refresh rate with it
+LOW_LATENCY_MODE = False                # precise frame pacer that starts each frame just in time
+LOW_LATENCY_MARGIN_MS = 1.0             # slack added to the predicted frame work
+PACER_SPIN_MS = 1.5                     # busy-wait the end of every sleep, OS sleeps overshoot
+LATENCY_LOG = "latency.jsonl"           # per-session input -> frame latency p50/p99
+
+# headless simulation
+HEADLESS_DT = SIM_DT                    # fixed simulation step in sec
+HEADLESS_MAX_TIME = 300.0               # round time cap in sec (a bot could survive forever)
+
+# bot training environment
+ENV_K_NEAREST = 8                       # asteroids in each observation, nearest first
+ENV_FRAME_SKIP = 4                      # simulation ticks per env step, the action is held for all
+ENV_DEATH_PENALTY = 100.0               # reward subtracted when the round ends by a collision
+
+# autopilot
+AUTOPILOT_BUDGET_MS = 2.0               # decision time per tick, the search stops there
+AUTOPILOT_HORIZON = 1.5                 # sec of predicted asteroid / ship motion
+AUTOPILOT_SAMPLES = 6                   # predicted positions per maneuver over the horizon
+AUTOPILOT_MAX_THREATS = 24              # nearest asteroids checked against each maneuver
+AUTOPILOT_SAFE_MARGIN = 30              # px of clearance that counts as safe
+AUTOPILOT_AIM_TOLERANCE = 6             # deg off the lead angle that still fires
+AUTOPILOT_WINDOW = 600                  # decision costs kept for percentiles
+
+# soak test
+SOAK_ROUNDS = 2000                      # rounds per soak run
+SOAK_ROUND_MAX_TIME = 60.0              # round time cap in sec, the autopilot can survive long
+SOAK_SAMPLE_EVERY = 20                  # rounds between memory / timing samples
+SOAK_WARMUP_ROUNDS = 100                # caches and pools fill up first, not part of the trend
+SOAK_MAX_MEMORY_GROWTH = 0.10           # allowed memory growth, first third -> last third of samples
+SOAK_MIN_MEMORY_GROWTH_MB = 2.0         # smaller growth never fails (allocator noise)
+SOAK_MIN_SPRITE_GROWTH = 50             # live sprite objects, same idea (pools hold some)
+SOAK_MIN_CHAIN_GROWTH = 10              # chain timers left at round end, same idea (live families hold some)
+SOAK_MAX_FRAME_GROWTH = 0.25            # allowed p99 tick time growth, same thirds
+
+# replays
+REPLAY_RECORD = True                    # record every live round's input log
+REPLAY_DIR = "replays"
+REPLAY_KEEP = 200                       # newest round files kept in REPLAY_DIR, older ones are deleted (0 = all)
+REPLAY_KEYFRAME_INTERVAL = 600          # ticks between full state keyframes (seek points)
+REPLAY_INPUT_CHUNK = 256                # input bytes buffered before handing to the writer thread
+
+# profiling
+PROFILER_WINDOW = 240                   # frames in the overlay's rolling percentiles
+PROFILER_TRACE_MAX = 36000              # frames kept for dumps (~10 min @ 60fps)
+
+# hud
+HUD_TEXT_CACHE_SIZE = 256               # cached text/widget surfaces (LRU)
+
+# dirty-rect rendering (software renderers / kiosks)
+DIRTY_RECTS_ENABLED = False             # push only changed regions instead of flipping the whole screen
+DIRTY_RECT_MAX_COVERAGE = 0.4           # dirty area / screen area above which a full flip is cheaper
+DIRTY_RECT_MAX_COUNT = 400              # more rects than this -> full flip
+
+# object pools
+OBJECT_POOLS_ENABLED = True             # reuse killed shots/asteroids instead of allocating new ones
+POOL_MAX_FREE = 1024                    # killed instances kept per class
+
+# effect caches
+EFFECT_CACHE_SIZE = 32                  # cached shield rings / bomb flash frames (LRU)
+EFFECT_ALPHA_STEP = 20                  # bomb flash alpha rounds to multiples of this (fewer cached frames), 180 peak stays exact
@@ -0,0 +1,169 @@
+import time
+from collections import deque
+import pygame
+from constants import INPUT_PAD_DEADZONE, INPUT_LATENCY_WINDOW
+
+# per-tick input as a bitmask, same shape for keyboard, headless runs and bots
+LEFT = 1 << 0
+RIGHT = 1 << 1
+THRUST = 1 << 2
+REVERSE = 1 << 3
+FIRE = 1 << 4
+
+NONE = 0
+ALL = LEFT | RIGHT | THRUST | REVERSE | FIRE
+
+
+# keyboard defaults: key -> bit, several keys may share a bit
+DEFAULT_BINDINGS = {
+    pygame.K_a: LEFT,
+    pygame.K_d: RIGHT,
+    pygame.K_w: THRUST,
+    pygame.K_s: REVERSE,
+    pygame.K_SPACE: FIRE,
+}
+# gamepad: button -> bit, left stick / d-pad steer and thrust
+DEFAULT_PAD_BUTTONS = {
+    0: FIRE,
+    1: FIRE,
+}
+
+
+class InputManager:
+    # builds the per-tick mask from pygame events instead of polling the keyboard.
+    # handle() every event, sample() once per simulation tick. a press is
+    # latched until the next sample, so a tap shorter than a tick still counts.
+    # press timestamps (perf_counter_ns when the event was handled) follow the
+    # press to the tick that consumes it; presented() after the flip turns
+    # that into press -> first frame on screen latency.
+
+    def __init__(self, bindings=None, pad_buttons=None, deadzone=None):
+        self.bindings = dict(DEFAULT_BINDINGS if bindings is None else bindings)
+        self.pad_buttons = dict(DEFAULT_PAD_BUTTONS if pad_buttons is None else pad_buttons)
+        self.deadzone = INPUT_PAD_DEADZONE if deadzone is None else deadzone
+        self.held = set()     # bound keys currently down
+        self.keys = NONE      # held keyboard bits
+        self.buttons = NONE   # held gamepad button bits
+        self.axes = NONE      # stick / d-pad bits
+        self.latched = NONE   # pressed since the last sample
+        self.pads = {}        # instance id -> pygame Joystick
+        self.press_ns = None      # earliest press not yet sampled
+        self.consumed_ns = None   # earliest press sampled since the last frame
+        self.latencies = deque(maxlen=INPUT_LATENCY_WINDOW)  # ns, press -> presented frame
+        self._axis = {}
+
+    # bindings
+    def bind(self, key, bit):
+        self.bindings[key] = bit
+        self._update_keys()
+
+    def unbind(self, key):
+        self.bindings.pop(key, None)
+        self.held.discard(key)
+        self._update_keys()
+
+    def keys_for(self, bit):
+        return [key for key, b in self.bindings.items() if b == bit]
+
+    def reset(self):
+        # forget held state (menus ate the key-ups)
+        self.keys = self.buttons = self.axes = self.latched = NONE
+        self.held.clear()
+        self._axis.clear()
+        self.press_ns = self.consumed_ns = None
+
+    # events
+    def handle(self, event):
+        kind = event.type
+        if kind == pygame.KEYDOWN:
+            bit = self.bindings.get(event.key)
+            if bit:
+                self.held.add(event.key)
+                self.keys |= bit
+                self._press(bit)
+        elif kind == pygame.KEYUP:
+            if event.key in self.held:
+                self.held.discard(event.key)
+                self._update_keys()  # another held key may share the bit
+        elif kind == pygame.JOYBUTTONDOWN:
+            bit = self.pad_buttons.get(event.button)
+            if bit:
+                self.buttons |= bit
+                self._press(bit)
+        elif kind == pygame.JOYBUTTONUP:
+            bit = self.pad_buttons.get(event.button)
+            if bit:
+                self.buttons &= ~bit
+        elif kind == pygame.JOYAXISMOTION:
+            self._axis[("axis", event.instance_id, event.axis)] = event.value
+            self._update_axes()
+        elif kind == pygame.JOYHATMOTION:
+            self._axis[("hat", event.instance_id, event.hat)] = event.value
+            self._update_axes()
+        elif kind == pygame.JOYDEVICEADDED:
+            pad = pygame.joystick.Joystick(event.device_index)
+            self.pads[pad.get_instance_id()] = pad
+        elif kind == pygame.JOYDEVICEREMOVED:
+            self.pads.pop(event.instance_id, None)
+            self._axis = {k: v for k, v in self._axis.items() if k[1] != event.instance_id}
+            self._update_axes()
+        elif kind == pygame.WINDOWFOCUSLOST:
+            # key-ups go to whoever has focus now
+            self.held.clear()
+            self.keys = NONE
+
+    def _press(self, bit):
+        self.latched |= bit
+        if self.press_ns is None:
+            self.press_ns = time.perf_counter_ns()
+
+    def _update_keys(self):
+        mask = NONE
+        for key in self.held:
+            mask |= self.bindings.get(key, NONE)
+        self.keys = mask
+
+    def _update_axes(self):
+        # left stick x/y (axes 0, 1) and any d-pad, up = thrust
+        mask = NONE
+        for (kind, _, index), value in self._axis.items():
+            if kind == "axis":
+                if index == 0:
+                    x, y = value, 0.0
+                elif index == 1:
+                    x, y = 0.0, -value
+                else:
+                    continue
+            else:
+                x, y = value
+            if x < -self.deadzone:
+                mask |= LEFT
+            elif x > self.deadzone:
+                mask |= RIGHT
+            if y > self.deadzone:
+                mask |= THRUST
+            elif y < -self.deadzone:
+                mask |= REVERSE
+        pressed = mask & ~self.axes
+        self.axes = mask
+        if pressed:
+            self._press(pressed)
+
+    # per tick / per frame
+    def sample(self):
+        mask = self.keys | self.buttons | self.axes | self.latched
+        self.latched = NONE
+        if self.press_ns is not None:
+            if self.consumed_ns is None:
+                self.consumed_ns = self.press_ns
+            self.press_ns = None
+        return mask
+
+    def presented(self, now_ns=None):
+        # call right after the flip, returns the latency in ns of a press shown in this frame
+        if self.consumed_ns is None:
+            return None
+        latency = (now_ns if now_ns is not None else time.perf_counter_ns()) - self.consumed_ns
+        self.consumed_ns = None
+        self.latencies.append(latency)
+        return latency
@@ -0,0 +1,58 @@
+import pygame
+from constants import DIRTY_RECTS_ENABLED, DIRTY_RECT_MAX_COVERAGE, DIRTY_RECT_MAX_COUNT
+
+
+class DirtyRects:
+    # partial screen updates.
+    # begin() erases only what was painted last frame, everything is drawn as
+    # usual and reports its painted Rect through add(), present() then pushes
+    # last frame's + this frame's rects with display.update. big or crowded
+    # frames (bomb rings, dense fields) fall back to a full flip.
+    # disabled -> plain fill + flip, same as before.
+
+    def __init__(self, screen, enabled=DIRTY_RECTS_ENABLED, background=(0, 0, 0)):
+        self.screen = screen
+        self.enabled = enabled
+        self.background = background
+        self.bounds = screen.get_rect()
+        self.max_area = self.bounds.w * self.bounds.h * DIRTY_RECT_MAX_COVERAGE
+        self.prev = []
+        self.rects = []
+        self.full = True  # first frame repaints everything
+        self.partial_frames = 0
+        self.full_frames = 0
+
+    def invalidate(self):
+        # something else drew over the screen (menus), repaint it all next frame
+        self.full = True
+
+    def begin(self):
+        if self.full or not self.enabled:
+            self.screen.fill(self.background)
+        else:
+            for rect in self.prev:
+                self.screen.fill(self.background, rect)
+        self.rects = []
+
+    def add(self, rect):
+        if rect is None or not self.enabled:
+            return
+        rect = rect.clip(self.bounds)
+        if rect.w and rect.h:
+            self.rects.append(rect)
+
+    def add_all(self, rects):
+        for rect in rects:
+            self.add(rect)
+
+    def present(self):
+        dirty = self.prev + self.rects
+        if (self.full or not self.enabled or len(dirty) > DIRTY_RECT_MAX_COUNT
+                or sum(r.w * r.h for r in dirty) > self.max_area):
+            pygame.display.flip()
+            self.full_frames += 1
+        else:
+            pygame.display.update(dirty)
+            self.partial_frames += 1
+        self.prev = self.rects
+        self.full = False
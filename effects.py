@@ -0,0 +1,72 @@
+import math
+import pygame
+from surfcache import SurfaceCache
+from constants import EFFECT_CACHE_SIZE, EFFECT_ALPHA_STEP
+
+# pre-rendered shield/overcharge rings and bomb flashes.
+# keys hold every value that shapes the surface (radius, widths, colors,
+# alpha), so changed constants (tuning overrides) simply miss and the old
+# entries age out of the LRU.
+_effect_cache = SurfaceCache(EFFECT_CACHE_SIZE)
+PAD = 2
+
+
+def dashed_ring(radius, dash_len, gap_len, width, color):
+    # returns (surface, arc rect offset), arcs sit at (PAD, PAD) in the surface
+    def render():
+        # approx. circumference and draw visuals/dashes
+        circumference = 2 * math.pi * radius
+        # how many dashes fit around
+        segment_len = max(1, dash_len + gap_len)
+        # evenly split circle
+        count = max(12, int(circumference / segment_len))
+        angle_step = 2 * math.pi / count
+        # shorter dash to avoid overlap, converting from linear dash to radians
+        dash_angle = (dash_len / circumference) * 2 * math.pi
+        dash_angle = min(dash_angle, angle_step * 0.9)
+
+        rect = pygame.Rect(PAD, PAD, radius * 2, radius * 2)
+        surf = pygame.Surface((rect.w + 2 * PAD, rect.h + 2 * PAD), pygame.SRCALPHA)
+        for i in range(count):
+            start_ang = i * angle_step
+            end_ang = start_ang + dash_angle
+            pygame.draw.arc(surf, color, rect, start_ang, end_ang, width)
+        return surf
+    return _effect_cache.get(("dashed", radius, dash_len, gap_len, width, color), render)
+
+
+def ring(radius, width, color):
+    # circle outline centered in the surface at (radius + PAD, radius + PAD)
+    r = int(radius)
+    def render():
+        surf = pygame.Surface((2 * (r + PAD), 2 * (r + PAD)), pygame.SRCALPHA)
+        pygame.draw.circle(surf, color, (r + PAD, r + PAD), r, width)
+        return surf
+    return _effect_cache.get(("ring", r, width, color), render)
+
+
+def blast_flash(radius, alpha, color):
+    # outline at `alpha` over a half-alpha disc, alpha rounded to the nearest EFFECT_ALPHA_STEP
+    alpha = min(255, (alpha + EFFECT_ALPHA_STEP // 2) // EFFECT_ALPHA_STEP * EFFECT_ALPHA_STEP)
+    def render():
+        size = int(radius * 2 + 8)
+        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        center = (size * 0.5, size * 0.5)
+        pygame.draw.circle(surf, (*color, alpha), center, radius, 2)
+        pygame.draw.circle(surf, (*color, max(0, alpha // 2)), center, max(0, radius - 8), 0)
+        return surf
+    return _effect_cache.get(("flash", radius, alpha, color), render)
+
+
+def draw_dashed_ring(screen, center, radius, dash_len, gap_len, width, color):
+    surf = dashed_ring(radius, dash_len, gap_len, width, color)
+    # same placement the arcs had when drawn straight onto the screen
+    rect = pygame.Rect(0, 0, radius * 2, radius * 2)
+    rect.center = (center.x, center.y)
+    return screen.blit(surf, (rect.x - PAD, rect.y - PAD))
+
+
+def draw_ring(screen, center, radius, width, color):
+    surf = ring(radius, width, color)
+    offset = int(radius) + PAD
+    return screen.blit(surf, (int(center[0]) - offset, int(center[1]) - offset))
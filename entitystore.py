@@ -0,0 +1,260 @@
+import pygame
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, DESPAWN_MARGIN, SHOT_LIFETIME
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:  # optional, game runs on plain sprites without it
+    np = None
+    HAVE_NUMPY = False
+
+KIND_NONE = 0
+KIND_ASTEROID = 1
+KIND_SHOT = 2
+
+
+class RowVector(pygame.Vector2):
+    # what a StoreVector read returns: a Vector2 copy of the row that writes
+    # in-place changes (v.x = 1, v.update(...), v += w, rotate_ip, ...) back
+    # through the attribute, so they land in the row (or the instance dict
+    # once the sprite is killed). arithmetic results keep the subclass but
+    # have no owner, they act like plain Vector2s.
+    __slots__ = ("_owner",)  # (StoreVector, sprite)
+
+    def _sync(self):
+        try:
+            field, obj = self._owner
+        except AttributeError:
+            return
+        field.__set__(obj, self)
+
+    def __setattr__(self, name, value):
+        # x, y and swizzles (v.xy = ...)
+        _vector_setattr(self, name, value)
+        self._sync()
+
+
+def _write_through(name):
+    base = getattr(pygame.Vector2, name)
+
+    def method(self, *args):
+        result = base(self, *args)
+        self._sync()
+        return result
+    method.__name__ = name
+    return method
+
+
+_vector_setattr = pygame.Vector2.__setattr__
+_set_owner = RowVector._owner.__set__
+for _name in ("__setitem__", "__iadd__", "__isub__", "__imul__", "__itruediv__", "__ifloordiv__", "update",
+              "normalize_ip", "scale_to_length", "rotate_ip", "rotate_rad_ip", "reflect_ip", "clamp_magnitude_ip",
+              "move_towards_ip"):
+    setattr(RowVector, _name, _write_through(_name))
+
+
+class StoreVector:
+    # Vector2 attribute that lives in a (N, 2) store array while the object
+    # owns a slot, and in the instance dict otherwise (not bound / killed).
+    # reads return a RowVector, so pos.x = 1 reaches the row like pos += v does.
+    def __init__(self, name, array_name):
+        self.name = name
+        self.array_name = array_name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        d = obj.__dict__
+        slot = d.get("_slot")
+        if slot is None:
+            try:
+                return d[self.name]
+            except KeyError:
+                raise AttributeError(self.name) from None
+        row = getattr(d["_store"], self.array_name)[slot]
+        v = RowVector(row[0], row[1])
+        _set_owner(v, (self, obj))
+        return v
+
+    def __set__(self, obj, value):
+        d = obj.__dict__
+        slot = d.get("_slot")
+        if slot is None:
+            d[self.name] = value
+        else:
+            getattr(d["_store"], self.array_name)[slot] = (value[0], value[1])
+
+
+class StoreScalar(StoreVector):
+    # same as StoreVector for a single number/flag
+    def __init__(self, name, array_name, cast=float):
+        super().__init__(name, array_name)
+        self.cast = cast
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        d = obj.__dict__
+        slot = d.get("_slot")
+        if slot is None:
+            try:
+                return d[self.name]
+            except KeyError:
+                raise AttributeError(self.name) from None
+        return self.cast(getattr(d["_store"], self.array_name)[slot])
+
+    def __set__(self, obj, value):
+        d = obj.__dict__
+        slot = d.get("_slot")
+        if slot is None:
+            d[self.name] = value
+        else:
+            getattr(d["_store"], self.array_name)[slot] = value
+
+
+# attribute name -> descriptor, installed on Asteroid/Shot when a store is in use
+STORE_FIELDS = {
+    "position": StoreVector("position", "pos"),
+    "prev_position": StoreVector("prev_position", "prev"),
+    "velocity": StoreVector("velocity", "vel"),
+    "radius": StoreScalar("radius", "radius"),
+    "rotation": StoreScalar("rotation", "rotation"),
+    "spin": StoreScalar("spin", "spin"),
+    "age": StoreScalar("age", "age"),
+    "_entered_screen": StoreScalar("_entered_screen", "entered", bool),
+}
+
+
+class EntityStore:
+    # struct-of-arrays world state for asteroids and shots.
+    # sprites keep working as thin views (see STORE_FIELDS), while step()
+    # integrates, wraps, spins, ages and culls everything in one numpy pass.
+
+    def __init__(self, capacity=256):
+        if not HAVE_NUMPY:
+            raise ImportError("EntityStore needs numpy")
+        self.capacity = 0
+        self.size = 0          # high-water mark, slots >= size were never used
+        self.free = []
+        self.objects = []
+        self._grow(capacity)
+
+    @staticmethod
+    def install(*classes):
+        # swap plain attributes for store-backed descriptors, idempotent
+        for cls in classes:
+            if cls.__dict__.get("position") is not STORE_FIELDS["position"]:
+                for name, field in STORE_FIELDS.items():
+                    setattr(cls, name, field)
+
+    @staticmethod
+    def uninstall(*classes):
+        # back to plain instance attributes, worlds without a store don't pay for
+        # the descriptors. values of unbound sprites already sit in their dicts.
+        for cls in classes:
+            if cls.__dict__.get("position") is STORE_FIELDS["position"]:
+                for name in STORE_FIELDS:
+                    delattr(cls, name)
+
+    def _grow(self, capacity):
+        def grow(arr, shape, dtype):
+            new = np.zeros(shape, dtype=dtype)
+            if arr is not None:
+                new[:len(arr)] = arr
+            return new
+
+        get = lambda name: getattr(self, name, None)
+        self.pos = grow(get("pos"), (capacity, 2), np.float64)
+        self.prev = grow(get("prev"), (capacity, 2), np.float64)
+        self.vel = grow(get("vel"), (capacity, 2), np.float64)
+        self.radius = grow(get("radius"), capacity, np.float64)
+        self.rotation = grow(get("rotation"), capacity, np.float64)
+        self.spin = grow(get("spin"), capacity, np.float64)
+        self.age = grow(get("age"), capacity, np.float64)
+        self.entered = grow(get("entered"), capacity, np.bool_)
+        self.alive = grow(get("alive"), capacity, np.bool_)
+        self.kind = grow(get("kind"), capacity, np.int8)
+        self.objects.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    # slots
+    def allocate(self, obj, kind):
+        if self.free:
+            slot = self.free.pop()
+        else:
+            if self.size == self.capacity:
+                self._grow(self.capacity * 2)
+            slot = self.size
+            self.size += 1
+        self.pos[slot] = self.prev[slot] = self.vel[slot] = 0.0
+        self.radius[slot] = self.rotation[slot] = self.spin[slot] = self.age[slot] = 0.0
+        self.entered[slot] = False
+        self.alive[slot] = True
+        self.kind[slot] = kind
+        self.objects[slot] = obj
+        return slot
+
+    def release(self, obj):
+        # copy the row back into the instance dict so a killed sprite stays readable
+        # (split() and the scorer look at it right after kill)
+        d = obj.__dict__
+        slot = d["_slot"]
+        for name, field in STORE_FIELDS.items():
+            d[name] = field.__get__(obj)
+        d["_slot"] = None
+        self.alive[slot] = False
+        self.kind[slot] = KIND_NONE
+        self.objects[slot] = None
+        self.free.append(slot)
+
+    def count(self, kind):
+        n = self.size
+        return int(np.count_nonzero(self.alive[:n] & (self.kind[:n] == kind)))
+
+    def indices(self, kind):
+        n = self.size
+        return np.flatnonzero(self.alive[:n] & (self.kind[:n] == kind))
+
+    # simulation
+    def step(self, dt):
+        n = self.size
+        if n == 0:
+            return
+        pos, vel = self.pos[:n], self.vel[:n]
+        kind = self.kind[:n]
+        alive = self.alive[:n]
+        shots = alive & (kind == KIND_SHOT)
+        rocks = alive & (kind == KIND_ASTEROID)
+
+        # shots remember where they were for swept collisions
+        self.age[:n][shots] += dt
+        self.prev[:n][shots] = pos[shots]
+
+        # euler integration for everything alive
+        pos[alive] += vel[alive] * dt
+
+        # asteroids: mark entered, then wrap only once they have been on the playfield
+        x, y = pos[:, 0], pos[:, 1]
+        inside = (x >= 0) & (x <= SCREEN_WIDTH) & (y >= 0) & (y <= SCREEN_HEIGHT)
+        entered = self.entered[:n]
+        entered |= rocks & inside
+        r = self.radius[:n]
+        wrap = rocks & entered
+        lo = wrap & (x < -r)
+        hi = wrap & (x > SCREEN_WIDTH + r)
+        x[lo] = SCREEN_WIDTH + r[lo]
+        x[hi] = -r[hi]
+        lo = wrap & (y < -r)
+        hi = wrap & (y > SCREEN_HEIGHT + r)
+        y[lo] = SCREEN_HEIGHT + r[lo]
+        y[hi] = -r[hi]
+
+        rot = self.rotation[:n]
+        rot[rocks] = (rot[rocks] + self.spin[:n][rocks] * dt) % 360.0
+
+        # shots: off-screen cull and time to live
+        dead = shots & ((x < -DESPAWN_MARGIN) | (x > SCREEN_WIDTH + DESPAWN_MARGIN) |
+                        (y < -DESPAWN_MARGIN) | (y > SCREEN_HEIGHT + DESPAWN_MARGIN) |
+                        (self.age[:n] >= SHOT_LIFETIME))
+        for slot in np.flatnonzero(dead):
+            self.objects[slot].kill()
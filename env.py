@@ -0,0 +1,305 @@
+import os
+# training boxes have no display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import math
+import random
+import time
+import controls
+from constants import (SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_SPEED, ASTEROID_MAX_RADIUS, PLAYER_SHOOT_COOLDOWN,
+                       POWERUP_WEAPON_DURATION, POWERUP_CONTROL_DURATION, POWERUP_OVERCHARGE_DURATION,
+                       HEADLESS_DT, HEADLESS_MAX_TIME, ENV_K_NEAREST, ENV_FRAME_SKIP, ENV_DEATH_PENALTY)
+from circleshape import wrapped_delta
+from entitystore import HAVE_NUMPY, KIND_ASTEROID, np
+from powerup import PowerUp
+from world import World
+
+# gym-style wrapper for training bots:
+#   obs = env.reset(); obs, reward, done, info = env.step(action)
+# action is a controls bitmask (0..controls.ALL), held for ENV_FRAME_SKIP ticks.
+# reward is the score gained during the step, minus ENV_DEATH_PENALTY on death.
+# the observation is one float32 vector, roughly in -1..1:
+#   player, status, nearest powerup, then the K nearest asteroids (nearest first)
+# positions are relative to the player and take the shortest way around the
+# screen wrap (asteroids still flying in from the edge are not wrapped yet).
+# worlds always run with the entity store, so the asteroid part is computed
+# on the store arrays into preallocated scratch buffers, no per-asteroid objects.
+
+PLAYER_FEATURES = ("x", "y", "vx", "vy", "heading_sin", "heading_cos", "shoot_ready")
+STATUS_FEATURES = ("shields", "weapon", "control", "overcharge")
+POWERUP_KINDS = tuple(PowerUp.COLORS)
+POWERUP_FEATURES = ("powerup", "powerup_dx", "powerup_dy", *POWERUP_KINDS)
+ASTEROID_FEATURES = ("present", "dx", "dy", "vx", "vy", "radius")
+HEAD_FEATURES = PLAYER_FEATURES + STATUS_FEATURES + POWERUP_FEATURES
+
+ACTIONS = controls.ALL + 1  # discrete action count
+MAX_SHIELDS = 3
+
+
+def observation_size(k=None):
+    k = ENV_K_NEAREST if k is None else k
+    return len(HEAD_FEATURES) + len(ASTEROID_FEATURES) * k
+
+
+def feature_names(k=None):
+    # label for every observation column, for debugging / logging
+    k = ENV_K_NEAREST if k is None else k
+    return [*HEAD_FEATURES, *(f"a{i}_{name}" for i in range(k) for name in ASTEROID_FEATURES)]
+
+
+def env_settings(overrides, k, frame_skip, dt, max_time):
+    # fill in the None settings, an override of the constant wins over its default
+    overrides = overrides or {}
+    def pick(value, name, default):
+        return overrides.get(name, default) if value is None else value
+    return (pick(k, "ENV_K_NEAREST", ENV_K_NEAREST), pick(frame_skip, "ENV_FRAME_SKIP", ENV_FRAME_SKIP),
+            pick(dt, "HEADLESS_DT", HEADLESS_DT), pick(max_time, "HEADLESS_MAX_TIME", HEADLESS_MAX_TIME))
+
+
+class Observation:
+    # writes the observation of a world into `out` (a float32 vector, may be a
+    # row of a bigger array). scratch arrays follow the store capacity.
+
+    def __init__(self, out, k=None):
+        self.k = ENV_K_NEAREST if k is None else k
+        self.out = out
+        self.head = out[:len(HEAD_FEATURES)]
+        self.rows = out[len(HEAD_FEATURES):].reshape(self.k, len(ASTEROID_FEATURES))
+        self.capacity = 0
+        self._grow(256)
+
+    def _grow(self, capacity):
+        self.dx = np.empty(capacity)
+        self.dy = np.empty(capacity)
+        self.tmp = np.empty(capacity)
+        self.d2 = np.empty(capacity)
+        self.mask = np.empty(capacity, dtype=np.bool_)
+        self.other = np.empty(capacity, dtype=np.bool_)
+        self.capacity = capacity
+
+    def fill(self, world):
+        p = world.player
+        px, py = p.position.x, p.position.y
+        head = self.head
+        heading = math.radians(p.rotation)
+        head[0] = px / SCREEN_WIDTH
+        head[1] = py / SCREEN_HEIGHT
+        head[2] = p.velocity.x / PLAYER_SPEED
+        head[3] = p.velocity.y / PLAYER_SPEED
+        head[4] = math.sin(heading)
+        head[5] = math.cos(heading)
+        head[6] = 1.0 - max(0.0, p.shoot_timer) / PLAYER_SHOOT_COOLDOWN
+        head[7] = p.shield_charges / MAX_SHIELDS
+        head[8] = max(0.0, p.weapon_boost_timer) / POWERUP_WEAPON_DURATION
+        head[9] = max(0.0, p.control_boost_timer) / POWERUP_CONTROL_DURATION
+        head[10] = max(0.0, p.overcharge_timer) / POWERUP_OVERCHARGE_DURATION
+        self._powerup(world, px, py)
+        self._asteroids(world, px, py)
+        return self.out
+
+    def _powerup(self, world, px, py):
+        # nearest one, there are rarely more than one or two
+        base = len(PLAYER_FEATURES) + len(STATUS_FEATURES)
+        self.head[base:].fill(0.0)
+        best = None
+        best_d2 = math.inf
+        for pw in world.powerups:
+            dx = wrapped_delta(pw.position.x - px, SCREEN_WIDTH)
+            dy = wrapped_delta(pw.position.y - py, SCREEN_HEIGHT)
+            d2 = dx * dx + dy * dy
+            if d2 < best_d2:
+                best, best_d2, best_dx, best_dy = pw, d2, dx, dy
+        if best is None:
+            return
+        head = self.head
+        head[base] = 1.0
+        head[base + 1] = best_dx / SCREEN_WIDTH
+        head[base + 2] = best_dy / SCREEN_HEIGHT
+        head[base + 3 + POWERUP_KINDS.index(best.kind)] = 1.0
+
+    def _asteroids(self, world, px, py):
+        rows = self.rows
+        rows.fill(0.0)
+        store = world.store
+        n = store.size
+        if n == 0:
+            return
+        if store.capacity > self.capacity:
+            self._grow(store.capacity)
+        dx, dy, tmp, d2 = self.dx[:n], self.dy[:n], self.tmp[:n], self.d2[:n]
+        mask, other = self.mask[:n], self.other[:n]
+        entered = store.entered[:n]
+
+        np.equal(store.kind[:n], KIND_ASTEROID, out=mask)
+        np.logical_and(mask, store.alive[:n], out=mask)
+        count = int(np.count_nonzero(mask))
+        if count == 0:
+            return
+
+        # relative position, wrapped only for asteroids that wrap themselves
+        for axis, delta, size in ((0, dx, SCREEN_WIDTH), (1, dy, SCREEN_HEIGHT)):
+            np.subtract(store.pos[:n, axis], px if axis == 0 else py, out=delta)
+            np.add(delta, size / 2, out=tmp)
+            np.mod(tmp, size, out=tmp)
+            np.subtract(tmp, size / 2, out=tmp)
+            np.copyto(delta, tmp, where=entered)
+
+        np.multiply(dx, dx, out=d2)
+        np.multiply(dy, dy, out=tmp)
+        np.add(d2, tmp, out=d2)
+        np.logical_not(mask, out=other)
+        np.copyto(d2, np.inf, where=other)
+
+        m = min(self.k, count)
+        if m < n:
+            idx = np.argpartition(d2, m - 1)[:m]
+        else:
+            idx = np.arange(n)
+        idx = idx[np.argsort(d2[idx], kind="stable")][:m]
+
+        rows[:m, 0] = 1.0
+        rows[:m, 1] = dx[idx] / SCREEN_WIDTH
+        rows[:m, 2] = dy[idx] / SCREEN_HEIGHT
+        rows[:m, 3] = store.vel[idx, 0] / PLAYER_SPEED
+        rows[:m, 4] = store.vel[idx, 1] / PLAYER_SPEED
+        rows[:m, 5] = store.radius[idx] / ASTEROID_MAX_RADIUS
+
+
+class AsteroidsEnv:
+    # one world. seed seeds the sequence of round seeds, reset(seed) pins one round.
+    # step() returns the same observation buffer every time, copy it to keep it.
+    # out: write observations into this float32 vector (VectorEnv rows)
+    # k / frame_skip / dt / max_time None = ENV_K_NEAREST / ENV_FRAME_SKIP /
+    # HEADLESS_DT / HEADLESS_MAX_TIME, taken from `overrides` when set there
+
+    def __init__(self, seed=None, overrides=None, k=None, frame_skip=None, dt=None, max_time=None, out=None):
+        if not HAVE_NUMPY:
+            raise ImportError("AsteroidsEnv needs numpy")
+        k, frame_skip, dt, max_time = env_settings(overrides, k, frame_skip, dt, max_time)
+        if frame_skip < 1:
+            raise ValueError(f"frame_skip must be >= 1, got {frame_skip}")
+        self.overrides = {**(overrides or {}), "ENTITY_STORE_ENABLED": True}
+        self.frame_skip = frame_skip
+        self.dt = dt
+        self.max_ticks = int(max_time / dt)
+        self.seeds = random.Random(seed)
+        self.obs = out if out is not None else np.zeros(observation_size(k), dtype=np.float32)
+        self.observation = Observation(self.obs, k)
+        self.world = None
+        self.done = True
+        self.info = {"score": 0, "ticks": 0, "time": 0.0, "seed": None, "truncated": False}
+
+    def reset(self, seed=None):
+        if self.world is not None:
+            self.world.clear()
+        self.world = World(self.overrides, seed=seed if seed is not None else self.seeds.getrandbits(32))
+        self.done = False
+        self._update_info(False)
+        return self.observation.fill(self.world)
+
+    def step(self, action):
+        if self.done:
+            raise RuntimeError("step() on a finished round, call reset() first")
+        action = int(action)
+        if not 0 <= action <= controls.ALL:
+            raise ValueError(f"action must be a controls mask in 0..{controls.ALL}, got {action}")
+        world = self.world
+        score = world.scorer.score
+        alive = True
+        for _ in range(self.frame_skip):
+            alive = world.step(self.dt, action)
+            if not alive or world.ticks >= self.max_ticks:
+                break
+        reward = float(world.scorer.score - score)
+        if not alive:
+            reward -= ENV_DEATH_PENALTY
+        truncated = alive and world.ticks >= self.max_ticks
+        self.done = not alive or truncated
+        self._update_info(truncated)
+        return self.observation.fill(world), reward, self.done, self.info
+
+    def _update_info(self, truncated):
+        world, info = self.world, self.info
+        info["score"] = world.scorer.score
+        info["ticks"] = world.ticks
+        info["time"] = world.time
+        info["seed"] = world.seed
+        info["truncated"] = truncated
+
+    def close(self):
+        if self.world is not None:
+            self.world.clear()
+            self.world = None
+        self.done = True
+
+
+class VectorEnv:
+    # n independent worlds stepped by one call, observations land in one
+    # (n, size) array. a finished world resets right away, its step() result
+    # still reports done=True with the final info, the obs row is already the new round.
+
+    def __init__(self, n, seed=None, overrides=None, k=None, frame_skip=None, dt=None, max_time=None):
+        k, frame_skip, dt, max_time = env_settings(overrides, k, frame_skip, dt, max_time)
+        seeds = random.Random(seed)
+        self.obs = np.zeros((n, observation_size(k)), dtype=np.float32)
+        self.rewards = np.zeros(n, dtype=np.float32)
+        self.dones = np.zeros(n, dtype=np.bool_)
+        self.envs = [AsteroidsEnv(seeds.getrandbits(32), overrides, k, frame_skip, dt, max_time, out=self.obs[i])
+                     for i in range(n)]
+        self.infos = [env.info for env in self.envs]
+
+    def __len__(self):
+        return len(self.envs)
+
+    def reset(self):
+        for env in self.envs:
+            env.reset()
+        self.infos = [env.info for env in self.envs]
+        return self.obs
+
+    def step(self, actions):
+        # actions: one mask per world
+        rewards, dones, infos = self.rewards, self.dones, self.infos
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            _, rewards[i], done, info = env.step(action)
+            dones[i] = done
+            if done:
+                infos[i] = dict(info)  # final stats, env.info moves on to the next round
+                env.reset()
+            else:
+                infos[i] = info
+        return self.obs, rewards, dones, infos
+
+    def close(self):
+        for env in self.envs:
+            env.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="env steps/sec with random actions")
+    parser.add_argument("--envs", type=int, default=16)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=ENV_K_NEAREST)
+    parser.add_argument("--frame-skip", type=int, default=ENV_FRAME_SKIP)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    venv = VectorEnv(args.envs, seed=args.seed, k=args.k, frame_skip=args.frame_skip)
+    rng = np.random.default_rng(args.seed)
+    venv.reset()
+    rounds = 0
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        _, _, dones, _ = venv.step(rng.integers(0, ACTIONS, size=len(venv)))
+        rounds += int(np.count_nonzero(dones))
+    elapsed = time.perf_counter() - start
+    steps = args.envs * args.steps
+    print(f"{steps} env steps ({steps * args.frame_skip} ticks, {rounds} rounds finished) in {elapsed:.2f}s "
+          f"({steps / elapsed:.0f} steps/s, {steps * args.frame_skip / elapsed:.0f} ticks/s)")
+    venv.close()
+
+
+if __name__ == "__main__":
+    main()
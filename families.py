@@ -0,0 +1,44 @@
+class FamilyIndex:
+    # live asteroid counts per family (root_id) and per branch (branch_id).
+    # Asteroid registers itself on spawn and unregisters on kill, so
+    # "is this family / branch cleared" is a dict lookup instead of a group scan.
+
+    def __init__(self):
+        self.roots = {}
+        self.branches = {}
+
+    def add(self, asteroid):
+        self.roots[asteroid.root_id] = self.roots.get(asteroid.root_id, 0) + 1
+        if asteroid.branch_id is not None:
+            self.branches[asteroid.branch_id] = self.branches.get(asteroid.branch_id, 0) + 1
+
+    def remove(self, asteroid):
+        self._drop(self.roots, asteroid.root_id)
+        if asteroid.branch_id is not None:
+            self._drop(self.branches, asteroid.branch_id)
+
+    def set_branch(self, asteroid, branch_id):
+        # move a live asteroid to another branch
+        if asteroid.branch_id is not None:
+            self._drop(self.branches, asteroid.branch_id)
+        asteroid.branch_id = branch_id
+        if branch_id is not None:
+            self.branches[branch_id] = self.branches.get(branch_id, 0) + 1
+
+    @staticmethod
+    def _drop(counts, key):
+        n = counts.get(key, 0) - 1
+        if n > 0:
+            counts[key] = n
+        else:
+            counts.pop(key, None)
+
+    def root_alive(self, root_id) -> int:
+        return self.roots.get(root_id, 0)
+
+    def branch_alive(self, branch_id) -> int:
+        return self.branches.get(branch_id, 0)
+
+    def clear(self):
+        self.roots.clear()
+        self.branches.clear()
@@ -0,0 +1,120 @@
+import os
+# no window, no audio: safe on boxes without a display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import random
+import time
+import controls
+from autopilot import Autopilot
+from constants import HEADLESS_DT, HEADLESS_MAX_TIME
+from profiler import FrameProfiler
+from world import World
+
+# input policies: policy(world) -> controls bitmask for the next tick
+
+
+def idle_policy(world):
+    return controls.NONE
+
+
+def spinner_policy(world):
+    # turn in place and keep firing, survives a surprising while
+    return controls.LEFT | controls.FIRE
+
+
+def make_random_policy(seed=None, hold_ticks=15):
+    # random button mashing, each choice held for a few ticks
+    rng = random.Random(seed)
+    state = {"mask": controls.NONE, "left": 0}
+
+    def policy(world):
+        if state["left"] <= 0:
+            state["mask"] = rng.randint(0, controls.ALL)
+            state["left"] = hold_ticks
+        state["left"] -= 1
+        return state["mask"]
+    return policy
+
+
+POLICIES = {
+    "idle": lambda seed: idle_policy,
+    "spinner": lambda seed: spinner_policy,
+    "random": make_random_policy,
+    # no wall-clock budget: seeded runs (and batch sweeps) stay reproducible
+    "autopilot": lambda seed: Autopilot(budget_ms=None),
+}
+
+
+def run_round(policy=idle_policy, dt=None, max_time=None, overrides=None, seed=None,
+              profiler=None):
+    # one full round at a fixed step, returns summary stats.
+    # dt / max_time None = HEADLESS_DT / HEADLESS_MAX_TIME with the overrides applied
+    world = World(overrides, seed=seed)
+    dt = HEADLESS_DT if dt is None else dt
+    max_time = HEADLESS_MAX_TIME if max_time is None else max_time
+    world.profiler = profiler
+    max_ticks = int(max_time / dt)
+    while world.ticks < max_ticks:
+        if profiler is not None:
+            profiler.begin_frame()
+        alive = world.step(dt, policy(world))
+        if profiler is not None:
+            profiler.end_frame({"asteroids": len(world.asteroids), "shots": len(world.shots),
+                                "powerups": len(world.powerups)})
+        if not alive:
+            break
+    stats = {
+        "time": world.time,
+        "ticks": world.ticks,
+        "score": world.scorer.score,
+        "seed": world.seed,
+        "survived": world.running,
+        "kills": dict(world.scorer.kills),
+        "chain_bonuses": world.scorer.chain_bonuses,
+    }
+    world.clear()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="run rounds without a display at a fixed timestep")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--dt", type=float, default=None, help=f"sec per tick, default {HEADLESS_DT}")
+    parser.add_argument("--max-time", type=float, default=None, help=f"round time cap in sec, default {HEADLESS_MAX_TIME}")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="spinner")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--profile", metavar="PATH", help="write per-tick phase timings (.csv or .json)")
+    parser.add_argument("--autopilot-budget", type=float, metavar="MS", default=None,
+                        help="per-tick decision budget for --policy autopilot, like live play "
+                             "(rounds then depend on machine load), default unlimited")
+    args = parser.parse_args()
+    profiler = FrameProfiler() if args.profile else None
+
+    start = time.perf_counter()
+    ticks = 0
+    for i in range(args.rounds):
+        seed = None if args.seed is None else args.seed + i
+        if args.policy == "autopilot" and args.autopilot_budget is not None:
+            policy = Autopilot(budget_ms=args.autopilot_budget)
+        else:
+            policy = POLICIES[args.policy](seed)
+        stats = run_round(policy, args.dt, args.max_time, seed=seed, profiler=profiler)
+        ticks += stats["ticks"]
+        line = f"round {i + 1:4d}  time {stats['time']:7.2f}s  score {stats['score']:6d}"
+        if isinstance(policy, Autopilot):
+            cost = policy.stats()
+            line += (f"  decide p50 {cost['cost_p50_ms']:.2f} p99 {cost['cost_p99_ms']:.2f} ms"
+                     f"  timeouts {cost['timeouts']}")
+        print(line)
+    elapsed = time.perf_counter() - start
+    print(f"{args.rounds} rounds, {ticks} ticks in {elapsed:.2f}s "
+          f"({args.rounds / elapsed:.1f} rounds/s, {ticks / elapsed:.0f} ticks/s)")
+    if profiler is not None:
+        print("\n".join(profiler.overlay_lines()))
+        print(f"trace -> {profiler.dump(args.profile)}")
+
+
+if __name__ == "__main__":
+    main()
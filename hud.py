@@ -0,0 +1,111 @@
+import pygame
+from surfcache import SurfaceCache
+from constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, HUD_TEXT_CACHE_SIZE,
+    POWERUP_WEAPON_DURATION, POWERUP_CONTROL_DURATION, POWERUP_OVERCHARGE_DURATION
+)
+
+# layout (same spots the hud always used)
+HUD_SIZE = (260, 100)
+SCORE_POS = (10, 10)
+PIP_CENTER_Y = 36
+PIP_SPACING = 20
+PIP_R = 6
+MAX_CHARGES = 3
+PIP_COLOR = (100, 200, 255)
+BAR_W = 120
+BAR_H = 10
+BAR_X = 10
+BAR_FRAME_COLOR = (60, 60, 60)
+# timer attribute, full duration, y, fill color
+BARS = (
+    ("weapon_boost_timer", POWERUP_WEAPON_DURATION, 50, (255, 180, 80)),
+    ("control_boost_timer", POWERUP_CONTROL_DURATION, 66, (120, 255, 150)),
+    ("overcharge_timer", POWERUP_OVERCHARGE_DURATION, 82, (200, 200, 255)),
+)
+
+
+class TextCache:
+    # rendered text surfaces keyed by (text, color)
+    def __init__(self, font, max_entries=HUD_TEXT_CACHE_SIZE):
+        self.font = font
+        self.cache = SurfaceCache(max_entries)
+
+    def render(self, text, color="white"):
+        return self.cache.get((text, color), lambda: self.font.render(text, False, color))
+
+
+class Hud:
+    # score, shield pips and boost bars.
+    # every widget surface is cached by its value; the widgets are composited
+    # into one persistent surface only when some value changed, otherwise a
+    # frame costs a single blit.
+
+    def __init__(self, font):
+        self.text = TextCache(font)
+        self.widgets = SurfaceCache(HUD_TEXT_CACHE_SIZE)
+        self.surface = pygame.Surface(HUD_SIZE, pygame.SRCALPHA)
+        self.state = None
+        self.redraws = 0
+
+    @staticmethod
+    def bar_fill(timer, duration):
+        # filled px of a boost bar, None hides it
+        if timer <= 0:
+            return None
+        remaining = max(0.0, min(1.0, timer / duration))
+        return int(BAR_W * remaining)
+
+    def _pips(self, charges):
+        def render():
+            w = MAX_CHARGES * (2 * PIP_R + PIP_SPACING)
+            surf = pygame.Surface((w, 2 * PIP_R + 1), pygame.SRCALPHA)
+            for i in range(MAX_CHARGES):
+                cx = i * (2 * PIP_R + PIP_SPACING) + PIP_R
+                # filled or outline
+                pygame.draw.circle(surf, PIP_COLOR, (cx, PIP_R), PIP_R, 0 if i < charges else 2)
+            return surf
+        return self.widgets.get(("pips", charges), render)
+
+    def _bar(self, color, filled_w):
+        def render():
+            surf = pygame.Surface((BAR_W, BAR_H), pygame.SRCALPHA)
+            pygame.draw.rect(surf, BAR_FRAME_COLOR, pygame.Rect(0, 0, BAR_W, BAR_H), 1)
+            pygame.draw.rect(surf, color, pygame.Rect(1, 1, max(0, filled_w - 2), BAR_H - 2))
+            return surf
+        return self.widgets.get(("bar", color, filled_w), render)
+
+    def draw(self, screen, player, scorer):
+        fills = tuple(self.bar_fill(getattr(player, attr), duration) for attr, duration, _, _ in BARS)
+        state = (scorer.score, player.shield_charges, fills)
+        if state != self.state:
+            self.state = state
+            self.redraws += 1
+            self._compose(*state)
+        return screen.blit(self.surface, (0, 0))
+
+    def _compose(self, score, charges, fills):
+        surf = self.surface
+        surf.fill((0, 0, 0, 0))
+        surf.blit(self.text.render(f"SCORE {score}"), SCORE_POS)
+        surf.blit(self._pips(charges), (12, PIP_CENTER_Y - PIP_R))
+        for (_, _, y, color), filled_w in zip(BARS, fills):
+            if filled_w is not None:
+                surf.blit(self._bar(color, filled_w), (BAR_X, y))
+
+
+def render_leaderboard(text, entries):
+    # whole game over screen, rendered once per menu visit
+    surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    title = text.render("HIGH SCORES")
+    surf.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 40))
+
+    y = 100
+    for i, (n, s) in enumerate(entries, start=1):
+        line = text.render(f"{i:2d}. {n:<12} {s:>6}")
+        surf.blit(line, (SCREEN_WIDTH//2 - line.get_width()//2, y))
+        y += 22
+
+    hint = text.render("[ENTER/SPACE/R] Play Again   [ESC/Q] Exit")
+    surf.blit(hint, (SCREEN_WIDTH//2 - hint.get_width()//2, SCREEN_HEIGHT - 60))
+    return surf
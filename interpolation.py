@@ -0,0 +1,51 @@
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, RENDER_INTERPOLATION
+import pygame
+
+
+class Interpolator:
+    # render-side smoothing for the fixed-step simulation.
+    # capture() remembers positions/rotations right before a frame's last
+    # step, draw() renders every sprite `alpha` of the way from there to the
+    # current state and then puts the real values back, so the simulation
+    # (and replays/digests) never sees blended values.
+    # a jump longer than half the screen is a wrap and snaps instead of
+    # sliding across; sprites spawned during the step draw where they are.
+
+    def __init__(self, enabled=RENDER_INTERPOLATION):
+        self.enabled = enabled
+        self.prev = {}
+
+    def capture(self, sprites):
+        if self.enabled:
+            self.prev = {s: (s.position.x, s.position.y, getattr(s, "rotation", None)) for s in sprites}
+
+    def draw(self, screen, sprites, alpha):
+        # returns the painted rects of every sprite
+        if not self.enabled or alpha >= 1.0:
+            return [s.draw(screen) for s in sprites]
+
+        alpha = max(0.0, alpha)
+        half_w, half_h = SCREEN_WIDTH * 0.5, SCREEN_HEIGHT * 0.5
+        rects = []
+        for s in sprites:
+            prev = self.prev.get(s)
+            if prev is None:
+                rects.append(s.draw(screen))
+                continue
+            px, py, prot = prev
+            position = s.position
+            dx, dy = position.x - px, position.y - py
+            if abs(dx) > half_w or abs(dy) > half_h:
+                rects.append(s.draw(screen))
+                continue
+
+            rotation = s.rotation if prot is not None else None
+            s.position = pygame.Vector2(px + dx * alpha, py + dy * alpha)
+            if rotation is not None:
+                # shortest way around
+                s.rotation = prot + ((rotation - prot + 180.0) % 360.0 - 180.0) * alpha
+            rects.append(s.draw(screen))
+            s.position = position
+            if rotation is not None:
+                s.rotation = rotation
+        return rects
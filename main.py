@@ -1,39 +1,22 @@
 import pygame
 from constants import *
-from player import Player
-from asteroid import Asteroid
-from asteroidfield import AsteroidField
-from shot import Shot
-from score import ScoreManager, Leaderboard
-from powerup import PowerUp, PowerUpSpawner
+from score import Leaderboard
+from world import World
+from replay import ReplayWriter, new_replay_path
+from profiler import FrameProfiler
+from hud import Hud, render_leaderboard
+from dirtyrects import DirtyRects
+from interpolation import Interpolator
+from pacing import FramePacer, log_latency
+import controls
+import effects
+import time
 
 def init_round():
-    # groups
-    updatable = pygame.sprite.Group()
-    drawable = pygame.sprite.Group()
-    asteroids = pygame.sprite.Group()
-    shots = pygame.sprite.Group()
-    powerups = pygame.sprite.Group()
+    # fresh world, also rewires the class-level containers to its groups
+    return World()
 
-    # containers
-    Player.containers = (updatable, drawable)
-    Asteroid.containers = (asteroids, updatable, drawable)
-    AsteroidField.containers = (updatable,)
-    Shot.containers = (shots, updatable, drawable)
-    PowerUp.containers = (powerups, updatable, drawable)
-    PowerUpSpawner.containers = (updatable,)
-
-    # instances
-    player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-    field = AsteroidField()
-    spawner = PowerUpSpawner(powerups, player_ref=player)
-
-    # score for this round
-    scorer = ScoreManager()
-
-    return updatable, drawable, asteroids, shots, powerups, player, field, spawner, scorer
-
-def prompt_name(screen, font):
+def prompt_name(screen, text):
     name = ""
     clock = pygame.time.Clock()
     while True:
@@ -50,18 +33,20 @@ def prompt_name(screen, font):
                         name += event.unicode.upper()
 
         screen.fill((0, 0, 0))
-        prompt = font.render("ENTER NAME:", False, "white")
-        entry  = font.render(name + "_", False, "white")
+        prompt = text.render("ENTER NAME:")
+        entry  = text.render(name + "_")
         screen.blit(prompt, (SCREEN_WIDTH//2 - prompt.get_width()//2, SCREEN_HEIGHT//2 - 40))
         screen.blit(entry,  (SCREEN_WIDTH//2 - entry.get_width()//2,  SCREEN_HEIGHT//2))
         pygame.display.flip()
         clock.tick(30)
 
-def game_over_menu(screen, font, leaderboard):
+def game_over_menu(screen, text, leaderboard):
     # show leaderboard and wait for input.
     # returns "restart" or "exit".
     # keys: R / ENTER / SPACE = restart,  ESC / Q / window close = exit
 
+    # nothing changes while the menu is up, render it once
+    board = render_leaderboard(text, leaderboard.top(10))
     clock = pygame.time.Clock()
     while True:
         for event in pygame.event.get():
@@ -73,246 +58,165 @@ def game_over_menu(screen, font, leaderboard):
                 if event.key in (pygame.K_r, pygame.K_RETURN, pygame.K_SPACE):
                     return "restart"
 
-        screen.fill((0, 0, 0))
-
-        title = font.render("HIGH SCORES", False, "white")
-        screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 40))
-
-        y = 100
-        for i, (n, s) in enumerate(leaderboard.top(10), start=1):
-            line = font.render(f"{i:2d}. {n:<12} {s:>6}", False, "white")
-            screen.blit(line, (SCREEN_WIDTH//2 - line.get_width()//2, y))
-            y += 22
-
-        hint = font.render("[ENTER/SPACE/R] Play Again   [ESC/Q] Exit", False, "white")
-        screen.blit(hint, (SCREEN_WIDTH//2 - hint.get_width()//2, SCREEN_HEIGHT - 60))
-
+        screen.blit(board, (0, 0))
         pygame.display.flip()
         clock.tick(30)
 
-def segment_hits_circle(p0, p1, center, radius_sum_sq):
-    # return True if segment (p0→p1) intersects a circle of given squared radius
-    v = p1 - p0
-    w = center - p0
-    v_len2 = v.x * v.x + v.y * v.y
-    if v_len2 == 0:
-        return (w.x * w.x + w.y * w.y) <= radius_sum_sq
-    t = max(0.0, min(1.0, (w.x * v.x + w.y * v.y) / v_len2))
-    closest = p0 + v * t
-    d = center - closest
-    return (d.x * d.x + d.y * d.y) <= radius_sum_sq
-
-def apply_bomb(player, asteroids, scorer, center=None):
-    center = center if center is not None else player.position
-    blast_r2 = POWERUP_BOMB_RADIUS * POWERUP_BOMB_RADIUS
-    for asteroid in list(asteroids):
-        if (asteroid.position - center).length_squared() <= blast_r2:
-            asteroid.kill()  # gone, no splits
-            family_cleared, from_big = scorer.asteroid_destroyed(asteroid, asteroids)
-            if family_cleared and from_big:
-                player.add_shield(1)
-
-def handle_powerup_pickups(powerups, player, asteroids, scorer):
-    for powerup in list(powerups):
-        delta = powerup.position - player.position
-        if delta.length_squared() <= (powerup.radius + player.radius) ** 2:
-            kind = powerup.kind
-            powerup.kill()
-            if kind == "bomb":
-                # delayed bomb: show ring, timed boom
-                player.pending_bombs.append({"timer": 0.5, "pos": player.position.copy()})
-            elif kind == "weapon":
-                # faster fire rate
-                player.activate_weapon_boost()
-            elif kind == "control":
-                # no drift
-                player.activate_control_boost()
-            elif kind == "overcharge":
-                # shield overdrive
-                player.activate_overcharge()
-
-def update_pending_bombs(dt, player, asteroids, scorer, flashes):
-    for bomb in list(player.pending_bombs):
-        bomb["timer"] -= dt
-        if bomb["timer"] <= 0:
-            apply_bomb(player, asteroids, scorer, center=bomb["pos"])
-            player.pending_bombs.remove(bomb)
-            flashes.append({"pos": bomb["pos"], "timer": 0.2})
-
 def draw_bomb_telegraphs(screen, pending_bombs):
+    # returns the painted rects
+    rects = []
     for bomb in pending_bombs:
         t = max(0.0, bomb["timer"])
         progress = 1.0 - min(1.0, t / 0.5)
         width = 1 + int(progress * 3)
-        pygame.draw.circle(screen, (255, 235, 50), bomb["pos"], POWERUP_BOMB_RADIUS, width)
+        rects.append(pygame.draw.circle(screen, (255, 235, 50), bomb["pos"], POWERUP_BOMB_RADIUS, width))
+    return rects
 
 def draw_blast_flashes(screen, flashes):
+    # returns the painted rects
+    rects = []
     for flash in flashes:
         t = flash["timer"]
         if t <= 0:
             continue
         alpha = int(180 * (t / 0.2))
-        r = POWERUP_BOMB_RADIUS
-        size = int(r * 2 + 8)
-        surf = pygame.Surface((size, size), pygame.SRCALPHA)
-        center = (size * 0.5, size * 0.5)
-        pygame.draw.circle(surf, (255, 235, 50, alpha), center, r, 2)
-        pygame.draw.circle(surf, (255, 235, 50, max(0, alpha // 2)), center, max(0, r - 8), 0)
+        surf = effects.blast_flash(POWERUP_BOMB_RADIUS, alpha, (255, 235, 50))
+        size = surf.get_width()
         base = (flash["pos"].x - size * 0.5, flash["pos"].y - size * 0.5)
-        screen.blit(surf, base)
+        rects.append(screen.blit(surf, base))
+    return rects
 
 def main():
     pygame.init()
 
     font = pygame.font.SysFont(UI_FONT_NAME, UI_FONT_SIZE)
     clock = pygame.time.Clock()
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    screen = None
+    if DISPLAY_VSYNC:
+        try:
+            screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SCALED, vsync=1)
+        except pygame.error:
+            pass  # no vsync on this driver
+    if screen is None:
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 
     leaderboard = Leaderboard()
+    profiler = FrameProfiler()  # F3 overlay, F4 dump trace
+    hud = Hud(font)
+    dirty = DirtyRects(screen)
+    inputs = controls.InputManager()  # keyboard + gamepads, events -> per-tick mask
+    pacer = FramePacer(DISPLAY_FPS, low_latency=True) if LOW_LATENCY_MODE else None
+    frame_events = []
+
+    def poll_events():
+        # handled as they come in, so presses are timestamped on arrival
+        for event in pygame.event.get():
+            inputs.handle(event)
+            frame_events.append(event)
+
+    def end_session():
+        leaderboard.close()
+        # last INPUT_LATENCY_WINDOW presses of the session, bounded however long it runs
+        log_latency(inputs.latencies, vsync=DISPLAY_VSYNC, low_latency=LOW_LATENCY_MODE, fps=DISPLAY_FPS)
+        pygame.quit()
 
     while True:
         # start a fresh round
-        updatable, drawable, asteroids, shots, powerups, player, field, spawner, scorer = init_round()
-        bomb_flashes = []
+        world = init_round()
+        world.profiler = profiler
+        player, scorer = world.player, world.scorer
+        replay = ReplayWriter(new_replay_path(), world) if REPLAY_RECORD else None
+        accumulator = 0.0
+        interp = Interpolator()
+        dirty.invalidate()  # menus drew over the screen
+        # time spent in the menus is not simulation time
+        clock.tick()
+        if pacer is not None:
+            pacer.reset()
+        inputs.reset()
 
         running = True
         while running:
-            dt = clock.tick(60) / 1000
-            dt = min(dt, 0.05) # no catch-up when on scoreboard
+            if pacer is not None:
+                frame_dt = pacer.wait(poll_events)
+            else:
+                frame_dt = clock.tick(DISPLAY_FPS) / 1000
+            profiler.begin_frame()
 
             # events
-            for event in pygame.event.get():
+            poll_events()
+            for event in frame_events:
                 if event.type == pygame.QUIT:
-                    pygame.quit()
+                    if replay is not None:
+                        replay.close()
+                    end_session()
                     return
-
-            # update
-            updatable.update(dt)
-            handle_powerup_pickups(powerups, player, asteroids, scorer)
-            update_pending_bombs(dt, player, asteroids, scorer, bomb_flashes)
-            for flash in list(bomb_flashes):
-                flash["timer"] -= dt
-                if flash["timer"] <= 0:
-                    bomb_flashes.remove(flash)
-
-            # collisions: player vs asteroids -> end round (unless overcharged)
-            for asteroid in list(asteroids):
-                # distance check using shield radius when active
-                delta = player.position - asteroid.position
-                dist2 = delta.length_squared()
-
-                # overcharge: smash asteroids, slow down a bit each hit
-                if player.is_overcharged():
-                    hit = dist2 <= (player.overcharge_radius() + asteroid.radius) ** 2
-                    if hit:
-                        asteroid.split()
-                        player.overcharge_hit_slow()
-                        family_cleared, from_big = scorer.asteroid_destroyed(asteroid, asteroids)
-                        if family_cleared and from_big:
-                            player.add_shield(1)
-                        continue
-
-                # 1) shield contact, only if shield is ready
-                if player.has_shield() and player.shield_iframes <= 0:
-                    sr = player.shield_radius()
-                    if dist2 <= (sr + asteroid.radius) ** 2:
-                        if player.consume_shield():
-                            player.shield_iframes = 0.25  # about 15 frames @ 60fps
-                            asteroid.split()
-                            continue  # handled -> next asteroid
-
-                # 2) hull contact (no shield)
-                if dist2 <= (player.radius + asteroid.radius) ** 2:
-                    running = False
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_F3:
+                        profiler.visible = not profiler.visible
+                    elif event.key == pygame.K_F4:
+                        stamp = time.strftime("%Y%m%d-%H%M%S")
+                        profiler.dump(f"profile-{stamp}.csv")
+                        profiler.dump(f"profile-{stamp}.json")
+            frame_events.clear()
+            profiler.lap("events")
+
+            # update + collisions in fixed steps, so the round can be replayed
+            # and plays the same at any frame rate
+            accumulator += frame_dt
+            steps = int(accumulator // SIM_DT)
+            if steps > SIM_MAX_STEPS_PER_FRAME:
+                # too far behind (window drag, breakpoint), drop the backlog
+                steps = SIM_MAX_STEPS_PER_FRAME
+                accumulator = steps * SIM_DT
+            for i in range(steps):
+                if not running:
                     break
-
-            # collisions: shots vs asteroids -> split + score + shields on clear
-            if running:
-                for asteroid in list(asteroids):
-                    for shot in list(shots):
-                        r_sum = asteroid.radius + shot.radius
-                        if segment_hits_circle(shot.prev_position, shot.position, asteroid.position, r_sum * r_sum):
-                            hit = asteroid
-                            asteroid.split()
-                            shot.kill()
-
-                            family_cleared, from_big = scorer.asteroid_destroyed(hit, asteroids)
-                            if family_cleared and from_big:
-                                player.add_shield(1)
-                            break
+                accumulator -= SIM_DT
+                if i == steps - 1:
+                    interp.capture(world.drawable)
+                mask = inputs.sample()
+                if replay is not None:
+                    replay.record(world, mask)
+                running = world.step(SIM_DT, mask)
 
             # draw
-            screen.fill((0, 0, 0))
-            draw_bomb_telegraphs(screen, player.pending_bombs)
-            draw_blast_flashes(screen, bomb_flashes)
-            score_surf = font.render(f"SCORE {scorer.score}", False, "white")
-            screen.blit(score_surf, (10, 10))
-
-            # shield charge
-            pip_center_y = 36
-            pip_spacing = 20
-            pip_r = 6
-            max_charges = 3
-            for i in range(max_charges):
-                cx = 12 + i * (2 * pip_r + pip_spacing) + pip_r
-                cy = pip_center_y
-                if i < player.shield_charges:
-                    # filled
-                    pygame.draw.circle(screen, (100, 200, 255), (cx, cy), pip_r, 0)
-                else:
-                    # outline
-                    pygame.draw.circle(screen, (100, 200, 255), (cx, cy), pip_r, 2)
-
-            # weapon boost indicator
-            if player.weapon_boost_timer > 0:
-                bar_w = 120
-                bar_h = 10
-                remaining = max(0.0, min(1.0, player.weapon_boost_timer / POWERUP_WEAPON_DURATION))
-                filled_w = int(bar_w * remaining)
-                x = 10
-                y = 50
-                pygame.draw.rect(screen, (60, 60, 60), pygame.Rect(x, y, bar_w, bar_h), 1)
-                pygame.draw.rect(screen, (255, 180, 80), pygame.Rect(x + 1, y + 1, max(0, filled_w - 2), bar_h - 2))
-
-            # control boost indicator
-            if player.control_boost_timer > 0:
-                bar_w = 120
-                bar_h = 10
-                remaining = max(0.0, min(1.0, player.control_boost_timer / POWERUP_CONTROL_DURATION))
-                filled_w = int(bar_w * remaining)
-                x = 10
-                y = 66
-                pygame.draw.rect(screen, (60, 60, 60), pygame.Rect(x, y, bar_w, bar_h), 1)
-                pygame.draw.rect(screen, (120, 255, 150), pygame.Rect(x + 1, y + 1, max(0, filled_w - 2), bar_h - 2))
-
-            # overcharge indicator
-            if player.overcharge_timer > 0:
-                bar_w = 120
-                bar_h = 10
-                remaining = max(0.0, min(1.0, player.overcharge_timer / POWERUP_OVERCHARGE_DURATION))
-                filled_w = int(bar_w * remaining)
-                x = 10
-                y = 82
-                pygame.draw.rect(screen, (60, 60, 60), pygame.Rect(x, y, bar_w, bar_h), 1)
-                pygame.draw.rect(screen, (200, 200, 255), pygame.Rect(x + 1, y + 1, max(0, filled_w - 2), bar_h - 2))
-
-            for obj in drawable:
-                obj.draw(screen)
-            pygame.display.flip()
-
-        # round end - stop all spawners/objects
-        for spr in list(updatable):
-            spr.kill()
-        shots.empty()
+            dirty.begin()
+            dirty.add_all(draw_bomb_telegraphs(screen, player.pending_bombs))
+            dirty.add_all(draw_blast_flashes(screen, world.bomb_flashes))
+            dirty.add(hud.draw(screen, player, scorer))
+            profiler.lap("hud")
+
+            # sprites drawn between the previous and the current step
+            dirty.add_all(interp.draw(screen, world.drawable, accumulator / SIM_DT))
+            profiler.lap("draw")
+            dirty.add(profiler.draw(screen, font))
+            profiler.lap("overlay")
+            dirty.present()
+            if pacer is not None:
+                pacer.frame_done()
+            inputs.presented()
+            profiler.lap("flip")
+            profiler.end_frame({
+                "asteroids": len(world.asteroids),
+                "shots": len(world.shots),
+                "powerups": len(world.powerups),
+                **{f"{name}_pooled": s["free"] for name, s in world.pool_stats().items()},
+            })
+
+        # round end - keep the input log, then stop all spawners/objects
+        if replay is not None:
+            replay.close(world)
+        world.clear()
 
         # round ended: prompt name, save score, show menu
-        name = prompt_name(screen, font)
+        name = prompt_name(screen, hud.text)
         if name is not None:
             leaderboard.submit(name, scorer.score, overwrite=False)
 
-        action = game_over_menu(screen, font, leaderboard)
+        action = game_over_menu(screen, hud.text, leaderboard)
         if action == "exit":
-            pygame.quit()
+            end_session()
             return
         # else "restart": loop continues and starts a new round
 
@@ -0,0 +1,90 @@
+import json
+import time
+from collections import deque
+from constants import LOW_LATENCY_MARGIN_MS, PACER_SPIN_MS, LATENCY_LOG
+from profiler import perf_ns, percentile
+
+
+class FramePacer:
+    # replaces Clock.tick: sleeps to the frame deadline in short slices and
+    # spins the last PACER_SPIN_MS, so frames start within microseconds
+    # instead of Clock's ~1 ms granularity. poll() runs every slice, so
+    # input events get handled (and timestamped) while we wait.
+    # low_latency: start each frame as late as possible - one period after
+    # the last present minus the predicted work time - so input is sampled
+    # right before simulation and rendering instead of a frame early.
+    # call frame_done() right after the flip.
+
+    def __init__(self, fps, low_latency=False):
+        self.period = int(1e9 / fps) if fps > 0 else 0
+        self.low_latency = low_latency
+        self.work = deque(maxlen=120)  # ns from wake-up to present
+        self.reset()
+
+    def reset(self):
+        now = perf_ns()
+        self.last_start = now
+        self.last_present = now
+
+    def predicted_work(self):
+        # slow end of recent frames plus a safety margin
+        if not self.work:
+            return self.period // 2
+        return percentile(sorted(self.work), 90) + int(LOW_LATENCY_MARGIN_MS * 1e6)
+
+    def wait(self, poll=None):
+        # returns seconds since the previous frame started
+        if self.period:
+            if self.low_latency:
+                deadline = self.last_present + self.period - self.predicted_work()
+            else:
+                deadline = self.last_start + self.period
+            now = perf_ns()
+            if deadline < now - self.period:
+                deadline = now  # way behind (stall), don't try to catch up with a burst
+            self._sleep_until(deadline, poll)
+        if poll is not None:
+            poll()
+        start = perf_ns()
+        dt = (start - self.last_start) / 1e9
+        self.last_start = start
+        return dt
+
+    def frame_done(self):
+        now = perf_ns()
+        self.work.append(now - self.last_start)
+        self.last_present = now
+
+    @staticmethod
+    def _sleep_until(deadline, poll):
+        spin = int(PACER_SPIN_MS * 1e6)
+        while True:
+            left = deadline - perf_ns()
+            if left <= 0:
+                return
+            # the last `spin` ns are a busy-wait, sleep() overshoots
+            if left > spin:
+                time.sleep(min(left - spin, 1_000_000) / 1e9)
+                if poll is not None:
+                    poll()
+
+
+def latency_summary(samples_ns):
+    # press -> presented frame, in ms
+    values = sorted(samples_ns)
+    return {
+        "samples": len(values),
+        "p50_ms": percentile(values, 50) / 1e6,
+        "p99_ms": percentile(values, 99) / 1e6,
+        "max_ms": (values[-1] / 1e6) if values else 0.0,
+    }
+
+
+def log_latency(samples_ns, path=LATENCY_LOG, **session):
+    # one json line per session, `session` adds the settings it ran with
+    if not samples_ns:
+        return None
+    entry = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), **session, **latency_summary(samples_ns)}
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    return entry
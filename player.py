@@ -8,7 +8,8 @@ from constants import (
     POWERUP_CONTROL_DURATION, POWERUP_OVERCHARGE_DURATION, POWERUP_OVERCHARGE_SLOW, POWERUP_OVERCHARGE_RADIUS_MULT
 )
 from shot import Shot
-import math
+import controls
+import effects
 
 class Player(CircleShape):
     def __init__(self, x: int, y: int):
@@ -46,24 +47,8 @@ class Player(CircleShape):
         return self.shield_radius() if self.has_shield() else self.radius
 
     def _draw_dashed_circle(self, screen, center, radius, dash_len, gap_len, width, color):
-        # approx. circumference and draw visuals/dashes
-        circumference = 2 * math.pi * radius
-        # how many dashes fit around
-        segment_len = max(1, dash_len + gap_len)
-        # evenly split circle
-        count = max(12, int(circumference / segment_len))
-        angle_step = 2 * math.pi / count
-        # shorter dash to avoid overlap, converting from linear dash to radians
-        dash_angle = (dash_len / circumference) * 2 * math.pi
-        dash_angle = min(dash_angle, angle_step * 0.9)
-
-        rect = pygame.Rect(0, 0, radius * 2, radius * 2)
-        rect.center = (center.x, center.y)
-
-        for i in range(count):
-            start_ang = i * angle_step
-            end_ang = start_ang + dash_angle
-            pygame.draw.arc(screen, color, rect, start_ang, end_ang, width)
+        # pre-rendered once per (radius, dash, gap, width, color), one blit per frame
+        return effects.draw_dashed_ring(screen, center, radius, dash_len, gap_len, width, color)
 
     def triangle(self):
         forward = pygame.Vector2(0, 1).rotate(self.rotation)
@@ -74,11 +59,12 @@ class Player(CircleShape):
         return [a, b, c]
 
     def draw(self, screen):
+        # returns the painted area (dirty-rect rendering)
         # ship
-        pygame.draw.polygon(screen, "white", self.triangle(), 2)
+        area = pygame.draw.polygon(screen, "white", self.triangle(), 2)
         # shields
         if self.has_shield():
-            self._draw_dashed_circle(
+            area.union_ip(self._draw_dashed_circle(
                 screen,
                 self.position,
                 self.shield_radius(),
@@ -86,10 +72,11 @@ class Player(CircleShape):
                 SHIELD_GAP_LEN,
                 SHIELD_LINE_WIDTH,
                 SHIELD_COLOR
-            )
+            ))
         # overcharge outer ring
         if self.is_overcharged():
-            pygame.draw.circle(screen, (200, 220, 255), self.position, self.overcharge_radius(), 2)
+            area.union_ip(effects.draw_ring(screen, self.position, self.overcharge_radius(), 2, (200, 220, 255)))
+        return area
 
     # weapon boost
     def is_weapon_boosted(self) -> bool:
@@ -117,7 +104,8 @@ class Player(CircleShape):
     def rotate(self, dt):
         self.rotation += PLAYER_TURN_SPEED * dt
 
-    def update(self, dt):
+    def update(self, dt, input_mask=controls.NONE):
+        # input_mask: controls bitmask for this tick (keyboard, pad, replay or bot)
         if self.shoot_timer > 0:
             self.shoot_timer -= dt
         if self.shield_iframes > 0:
@@ -129,13 +117,11 @@ class Player(CircleShape):
         if self.overcharge_timer > 0:
             self.overcharge_timer -= dt
 
-        keys = pygame.key.get_pressed()
-
         # rotation
-        if keys[pygame.K_a]:
+        if input_mask & controls.LEFT:
             self.rotate(-dt)
 
-        if keys[pygame.K_d]:
+        if input_mask & controls.RIGHT:
             self.rotate(dt)
 
         # thrust
@@ -143,10 +129,10 @@ class Player(CircleShape):
         forward = pygame.Vector2(0, 1).rotate(self.rotation)
         thrust = pygame.Vector2(0, 0)
 
-        if keys[pygame.K_w]:
+        if input_mask & controls.THRUST:
             thrust += forward * PLAYER_SPEED
 
-        if keys[pygame.K_s]:
+        if input_mask & controls.REVERSE:
             # lighter reverse
             thrust -= forward * (0.5 * PLAYER_SPEED)
 
@@ -167,7 +153,7 @@ class Player(CircleShape):
         self.wrap_position()
 
         # shooting
-        if keys[pygame.K_SPACE]:
+        if input_mask & controls.FIRE:
             self.shoot()
 
     def shoot(self):
@@ -182,7 +168,7 @@ class Player(CircleShape):
         # improving looks
         nose = self.triangle()[0]
         for ang in spreads:
-            shot = Shot(nose.x, nose.y)
+            shot = Shot.create(nose.x, nose.y)
             shot.velocity = pygame.Vector2(0, 1).rotate(self.rotation + ang) * PLAYER_SHOOT_SPEED
 
         self.shoot_timer = cooldown
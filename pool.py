@@ -0,0 +1,38 @@
+from constants import POOL_MAX_FREE
+
+
+class Pool:
+    # free list of killed sprites of one class, reused by CircleShape.create.
+    # a killed instance parks in `pending` until recycle() (start of every
+    # world tick): dead sprites are still read right after kill() (split,
+    # scoring, bomb batches), so they must not be handed out in the same tick.
+
+    def __init__(self, max_free=None):
+        self.max_free = POOL_MAX_FREE if max_free is None else max_free
+        self.pending = []
+        self.free = []
+        self.created = 0   # instances built because the free list was empty
+        self.reused = 0
+
+    def release(self, obj):
+        if len(self.pending) + len(self.free) < self.max_free:
+            self.pending.append(obj)
+
+    def acquire(self):
+        if self.free:
+            self.reused += 1
+            return self.free.pop()
+        self.created += 1
+        return None
+
+    def recycle(self):
+        self.free.extend(self.pending)
+        self.pending.clear()
+
+    def clear(self):
+        self.pending.clear()
+        self.free.clear()
+
+    def stats(self):
+        return {"free": len(self.free), "pending": len(self.pending),
+                "created": self.created, "reused": self.reused}
@@ -23,8 +23,9 @@ class PowerUp(CircleShape):
         self.ttl = POWERUP_DESPAWN_TIME
 
     def draw(self, screen):
+        # returns the painted area, the icons stay inside the ring
         color = self.COLORS.get(self.kind, "white")
-        pygame.draw.circle(screen, color, self.position, self.radius, 2)
+        area = pygame.draw.circle(screen, color, self.position, self.radius, 2)
 
         # simple icon per type
         if self.kind == "bomb":
@@ -41,6 +42,7 @@ class PowerUp(CircleShape):
         elif self.kind == "overcharge":
             pygame.draw.circle(screen, color, self.position, 6, 1)
             pygame.draw.circle(screen, color, self.position, 2, 0)
+        return area
 
     def update(self, dt):
         self.ttl -= dt
@@ -51,6 +53,8 @@ class PowerUp(CircleShape):
 
 
 class PowerUpSpawner(pygame.sprite.Sprite):
+    rng = random  # per-round random.Random, set like containers
+
     def __init__(self, powerup_group, player_ref=None):
         if hasattr(self, "containers"):
             super().__init__(self.containers)
@@ -58,24 +62,24 @@ class PowerUpSpawner(pygame.sprite.Sprite):
             super().__init__()
         self.powerups = powerup_group
         self.player_ref = player_ref
-        self.timer = random.uniform(POWERUP_SPAWN_INTERVAL_MIN, POWERUP_SPAWN_INTERVAL_MAX)
+        self.timer = self.rng.uniform(POWERUP_SPAWN_INTERVAL_MIN, POWERUP_SPAWN_INTERVAL_MAX)
 
     def _random_position(self, radius):
         # bias spawn near player if available, but keep fully on screen
         if self.player_ref is not None:
             px, py = self.player_ref.position
             jitter = POWERUP_RADIUS * 12
-            x = random.uniform(max(radius, px - jitter), min(SCREEN_WIDTH - radius, px + jitter))
-            y = random.uniform(max(radius, py - jitter), min(SCREEN_HEIGHT - radius, py + jitter))
+            x = self.rng.uniform(max(radius, px - jitter), min(SCREEN_WIDTH - radius, px + jitter))
+            y = self.rng.uniform(max(radius, py - jitter), min(SCREEN_HEIGHT - radius, py + jitter))
             return pygame.Vector2(x, y)
         else:
             return pygame.Vector2(
-                random.uniform(radius, SCREEN_WIDTH - radius),
-                random.uniform(radius, SCREEN_HEIGHT - radius)
+                self.rng.uniform(radius, SCREEN_WIDTH - radius),
+                self.rng.uniform(radius, SCREEN_HEIGHT - radius)
             )
 
     def _next_spawn_time(self):
-        return random.uniform(POWERUP_SPAWN_INTERVAL_MIN, POWERUP_SPAWN_INTERVAL_MAX)
+        return self.rng.uniform(POWERUP_SPAWN_INTERVAL_MIN, POWERUP_SPAWN_INTERVAL_MAX)
 
     def update(self, dt):
         if len(self.powerups) > 0:
@@ -86,7 +90,7 @@ class PowerUpSpawner(pygame.sprite.Sprite):
             return
 
         # spawn one power-up
-        kind = random.choice(["bomb", "weapon", "control", "overcharge"])
+        kind = self.rng.choice(["bomb", "weapon", "control", "overcharge"])
         pos = self._random_position(POWERUP_RADIUS)
         PowerUp(pos.x, pos.y, kind)
 
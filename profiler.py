@@ -0,0 +1,126 @@
+import csv
+import gc
+import json
+import sys
+import time
+from collections import deque
+from constants import PROFILER_WINDOW, PROFILER_TRACE_MAX
+
+perf_ns = time.perf_counter_ns
+
+
+def percentile(sorted_values, p):
+    # nearest-rank on an already sorted list
+    if not sorted_values:
+        return 0
+    k = max(0, min(len(sorted_values) - 1, int(round(p / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+class FrameProfiler:
+    # per-frame timings split into named phases.
+    # begin_frame() ... lap("phase") after each phase ... end_frame(counts)
+    # laps with the same name inside one frame add up (fixed-step substeps).
+
+    def __init__(self, window=PROFILER_WINDOW, trace_max=PROFILER_TRACE_MAX):
+        self.window = deque(maxlen=window)      # recent frames for the overlay
+        self.trace = deque(maxlen=trace_max)    # longer history for dumps
+        self.phase_names = []                   # first-seen order, keeps columns stable
+        self.visible = False
+        self.frame = None
+        self._last = 0
+        self._frame_start = 0
+        self._blocks = 0
+        self._collections = 0
+
+    @staticmethod
+    def _gc_collections():
+        return sum(s["collections"] for s in gc.get_stats())
+
+    def begin_frame(self):
+        now = perf_ns()
+        self.frame = {}
+        self._frame_start = self._last = now
+        self._blocks = sys.getallocatedblocks()
+        self._collections = self._gc_collections()
+
+    def lap(self, name):
+        # time since the previous lap (or frame start) goes to `name`
+        now = perf_ns()
+        if self.frame is None:
+            self._last = now
+            return
+        self.frame[name] = self.frame.get(name, 0) + (now - self._last)
+        self._last = now
+        if name not in self.phase_names:
+            self.phase_names.append(name)
+
+    def end_frame(self, counts=None):
+        if self.frame is None:
+            return
+        row = {
+            "t": self._frame_start,
+            "total": perf_ns() - self._frame_start,
+            "phases": self.frame,
+            "counts": counts or {},
+            # net new memory blocks and gc runs during the frame
+            "alloc_blocks": sys.getallocatedblocks() - self._blocks,
+            "gc": self._gc_collections() - self._collections,
+        }
+        self.window.append(row)
+        self.trace.append(row)
+        self.frame = None
+
+    # stats
+    def percentiles(self, name, ps=(50, 95, 99)):
+        if name == "total":
+            values = sorted(r["total"] for r in self.window)
+        else:
+            values = sorted(r["phases"].get(name, 0) for r in self.window)
+        return [percentile(values, p) for p in ps]
+
+    def overlay_lines(self):
+        lines = ["phase          p50    p95    p99 ms"]
+        for name in self.phase_names + ["total"]:
+            p50, p95, p99 = (v / 1e6 for v in self.percentiles(name))
+            lines.append(f"{name:<12} {p50:6.2f} {p95:6.2f} {p99:6.2f}")
+        if self.window:
+            last = self.window[-1]
+            counts = "  ".join(f"{k} {v}" for k, v in last["counts"].items())
+            lines.append(counts)
+            lines.append(f"alloc {last['alloc_blocks']:+d}  gc {last['gc']}")
+        return lines
+
+    def draw(self, screen, font):
+        # returns the painted area, None when hidden
+        if not self.visible:
+            return None
+        y = 10
+        x = screen.get_width() - 10
+        area = None
+        for line in self.overlay_lines():
+            surf = font.render(line, False, (180, 255, 180))
+            rect = screen.blit(surf, (x - surf.get_width(), y))
+            area = rect if area is None else area.union(rect)
+            y += font.get_linesize()
+        return area
+
+    # dumps
+    def dump(self, path):
+        # .csv -> one row per frame (ms columns), anything else -> json trace
+        rows = list(self.trace)
+        if path.endswith(".csv"):
+            count_names = sorted({k for r in rows for k in r["counts"]})
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["t_ns", "total_ms"] + [f"{n}_ms" for n in self.phase_names]
+                                + count_names + ["alloc_blocks", "gc"])
+                for r in rows:
+                    writer.writerow([r["t"], r["total"] / 1e6]
+                                    + [r["phases"].get(n, 0) / 1e6 for n in self.phase_names]
+                                    + [r["counts"].get(n, 0) for n in count_names]
+                                    + [r["alloc_blocks"], r["gc"]])
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"phases": self.phase_names, "frames": rows}, f, separators=(",", ":"))
+        return path
@@ -0,0 +1,235 @@
+import os
+import argparse
+import json
+import queue
+import struct
+import threading
+import time
+import zlib
+from constants import SIM_DT, REPLAY_DIR, REPLAY_KEEP, REPLAY_KEYFRAME_INTERVAL, REPLAY_INPUT_CHUNK
+from world import World
+
+# binary replay file, little endian, append-only:
+#   header  MAGIC, version u16, seed u64, dt f64, overrides json (u32 len + bytes)
+#   chunks  tag u8, tick u32, payload len u32, payload
+#     I  controls bitmasks for ticks [tick, tick + len), one byte each
+#     K  zlib(json(World.snapshot())) taken before stepping `tick`
+#     E  end of round: score i64 + sha1 digest (20 bytes)
+# a crash leaves a valid prefix, readers stop at the first truncated chunk.
+
+MAGIC = b"ASTR"
+VERSION = 2  # 2: asteroids pick library outlines (different rng draws than 1)
+_HEADER = struct.Struct("<4sHQd")
+_CHUNK = struct.Struct("<BII")
+_END = struct.Struct("<q20s")
+TAG_INPUT = ord("I")
+TAG_KEYFRAME = ord("K")
+TAG_END = ord("E")
+
+
+def replay_files(directory):
+    # recorded rounds, oldest first (names sort by time)
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return [os.path.join(directory, n) for n in sorted(names) if n.startswith("round-") and n.endswith(".rpl")]
+
+
+def new_replay_path(directory=None, keep=None):
+    # round-YYYYmmdd-HHMMSS-<ns>.rpl, never an existing file. drops the oldest
+    # rounds so that with the new one at most `keep` are left (0 = keep all).
+    directory = REPLAY_DIR if directory is None else directory
+    keep = REPLAY_KEEP if keep is None else keep
+    os.makedirs(directory, exist_ok=True)
+    if keep > 0:
+        for old in replay_files(directory)[:-keep + 1 or None]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass  # open elsewhere / already gone, next round tries again
+    now = time.time_ns()
+    base = os.path.join(directory, time.strftime("round-%Y%m%d-%H%M%S", time.localtime(now // 10**9)) +
+                        f"-{now % 10**9:09d}")
+    path, n = base + ".rpl", 1
+    while os.path.exists(path):
+        path, n = f"{base}-{n}.rpl", n + 1
+    return path
+
+
+class ReplayWriter:
+    # records one round. the game thread only appends bytes / hands over
+    # snapshot dicts; encoding, compression and disk writes happen on a
+    # background thread so recording never blocks a frame.
+
+    def __init__(self, path, world, dt=SIM_DT, keyframe_interval=REPLAY_KEYFRAME_INTERVAL):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.pending = bytearray()
+        self.pending_tick = world.ticks
+        self.queue = queue.Queue()
+        self.error = None
+
+        overrides = json.dumps(world.overrides or {}).encode("utf-8")
+        header = _HEADER.pack(MAGIC, VERSION, world.seed, dt) + struct.pack("<I", len(overrides)) + overrides
+        self.queue.put(("raw", header))
+        self.thread = threading.Thread(target=self._run, name="replay-writer", daemon=True)
+        self.thread.start()
+
+    def record(self, world, mask):
+        # call once per tick, before world.step(dt, mask)
+        tick = world.ticks
+        if tick and tick % self.keyframe_interval == 0:
+            self._flush_inputs()
+            self.queue.put(("keyframe", (tick, world.snapshot())))
+        self.pending.append(mask)
+        if len(self.pending) >= REPLAY_INPUT_CHUNK:
+            self._flush_inputs()
+
+    def _flush_inputs(self):
+        if self.pending:
+            self.queue.put(("raw", _CHUNK.pack(TAG_INPUT, self.pending_tick, len(self.pending)) + bytes(self.pending)))
+            self.pending_tick += len(self.pending)
+            self.pending = bytearray()
+
+    def close(self, world=None):
+        # flush everything, write the end marker when the round finished, wait for the disk
+        self._flush_inputs()
+        if world is not None:
+            end = _END.pack(world.scorer.score, bytes.fromhex(world.digest()))
+            self.queue.put(("raw", _CHUNK.pack(TAG_END, world.ticks, len(end)) + end))
+        self.queue.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def _run(self):
+        try:
+            with open(self.path, "wb") as f:
+                while True:
+                    item = self.queue.get()
+                    if item is None:
+                        break
+                    kind, data = item
+                    if kind == "keyframe":
+                        tick, state = data
+                        payload = zlib.compress(json.dumps(state, separators=(",", ":")).encode("utf-8"))
+                        data = _CHUNK.pack(TAG_KEYFRAME, tick, len(payload)) + payload
+                    f.write(data)
+                    if self.queue.empty():
+                        f.flush()
+        except Exception as exc:  # surfaced on close()
+            self.error = exc
+
+
+class ReplayReader:
+    # scans a replay once: all inputs in memory, keyframes indexed by tick (read lazily)
+
+    def __init__(self, path):
+        self.path = path
+        self.masks = bytearray()
+        self.keyframes = {}     # tick -> (offset, length)
+        self.final_score = None
+        self.final_digest = None
+        self.final_tick = None
+
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, self.seed, self.dt = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a replay file (or unsupported version)")
+        offset = _HEADER.size
+        (n,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        self.overrides = json.loads(data[offset:offset + n].decode("utf-8")) or None
+        offset += n
+
+        while offset + _CHUNK.size <= len(data):
+            tag, tick, length = _CHUNK.unpack_from(data, offset)
+            start = offset + _CHUNK.size
+            if start + length > len(data):
+                break  # truncated tail from a crash
+            if tag == TAG_INPUT:
+                if tick != len(self.masks):
+                    raise ValueError(f"{path}: input gap at tick {tick}")
+                self.masks += data[start:start + length]
+            elif tag == TAG_KEYFRAME:
+                self.keyframes[tick] = (start, length)
+            elif tag == TAG_END:
+                self.final_score, digest = _END.unpack_from(data, start)
+                self.final_digest = digest.hex()
+                self.final_tick = tick
+            offset = start + length
+
+    def __len__(self):
+        return len(self.masks)
+
+    def keyframe(self, tick):
+        offset, length = self.keyframes[tick]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(zlib.decompress(f.read(length)))
+
+
+class Playback:
+    # headless playback: seek() jumps via the nearest keyframe, advance() fast-forwards
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.world = World(reader.overrides, seed=reader.seed)
+
+    @property
+    def tick(self):
+        return self.world.ticks
+
+    def seek(self, tick):
+        tick = max(0, min(tick, len(self.reader)))
+        # only go back to a keyframe if it beats stepping on from where we are
+        base = max((k for k in self.reader.keyframes if k <= tick), default=0)
+        if tick < self.world.ticks or base > self.world.ticks:
+            if base:
+                self.world.restore(self.reader.keyframe(base))
+            else:
+                self.world.clear()
+                self.world = World(self.reader.overrides, seed=self.reader.seed)
+        return self.advance(tick - self.world.ticks)
+
+    def advance(self, ticks):
+        # step up to `ticks` recorded inputs as fast as possible, False once the round is over
+        world, masks, dt = self.world, self.reader.masks, self.reader.dt
+        end = min(world.ticks + ticks, len(masks))
+        while world.ticks < end:
+            if not world.step(dt, masks[world.ticks]):
+                return False
+        return world.running and world.ticks < len(masks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="re-run a recorded round and check it matches")
+    parser.add_argument("path")
+    parser.add_argument("--seek", type=int, default=None, help="jump to this tick via keyframes and stop")
+    args = parser.parse_args()
+    # the live game imports this module too, only the cli goes windowless
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    reader = ReplayReader(args.path)
+    playback = Playback(reader)
+    start = time.perf_counter()
+    if args.seek is not None:
+        playback.seek(args.seek)
+    else:
+        playback.advance(len(reader))
+    elapsed = time.perf_counter() - start
+    world = playback.world
+    digest = world.digest()
+    speed = world.ticks * reader.dt / elapsed if elapsed > 0 else float("inf")
+    print(f"tick {world.ticks}/{len(reader)} in {elapsed:.2f}s ({speed:.0f}x realtime)  "
+          f"score {world.scorer.score}  keyframes {len(reader.keyframes)}")
+    if args.seek is None and reader.final_digest is not None:
+        ok = digest == reader.final_digest
+        print("replay matches recording" if ok else "replay DIVERGED from recording")
+        raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
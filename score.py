@@ -1,13 +1,33 @@
+import atexit
+import bisect
 import json
 import os
+import queue
+import threading
+import time
 from constants import (POINTS_LARGE, POINTS_MEDIUM, POINTS_SMALL, CHAIN_BONUS,
                        HIGHSCORES_PATH, ASTEROID_MIN_RADIUS, ASTEROID_LARGE_RADIUS,
-                       CHAIN_TIME_LIMIT)
+                       CHAIN_TIME_LIMIT, LEADERBOARD_COMPACT_EVERY, LEADERBOARD_BACKGROUND_IO,
+                       LEADERBOARD_FSYNC, LEADERBOARD_FSYNC_INTERVAL)
 
 class ScoreManager:
-    def __init__(self):
+    def __init__(self, families=None):
+        # families: FamilyIndex for O(1) "family cleared" checks, None = scan the group
+        self.families = families
         self.score = 0
         self.chain_started_at = {}
+        # round stats
+        self.kills = {"large": 0, "medium": 0, "small": 0}
+        self.chain_bonuses = 0
+
+    @staticmethod
+    def size_name(radius):
+        steps = int(round(radius / ASTEROID_MIN_RADIUS))
+        if steps >= 3:
+            return "large"
+        elif steps == 2:
+            return "medium"
+        return "small"
 
     def points_for_radius(self, radius):
         # infer size by how many steps of ASTEROID_MIN_RADIUS
@@ -19,7 +39,7 @@ class ScoreManager:
         else:  # small
             return POINTS_SMALL
 
-    def asteroid_destroyed(self, asteroid, asteroids_group, now):
+    def _record_kill(self, asteroid, now):
         # record first kill in the family
         root = asteroid.root_id
         if root not in self.chain_started_at:
@@ -27,53 +47,268 @@ class ScoreManager:
 
         # base points
         self.score += self.points_for_radius(asteroid.radius)
+        self.kills[self.size_name(asteroid.radius)] += 1
 
+    def _family_left(self, root, asteroids_group):
+        if self.families is not None:
+            return self.families.root_alive(root) > 0
+        return any(a.root_id == root for a in asteroids_group)
+
+    def _settle_family(self, root, asteroids_group, now):
         # chain bonus, family cleared when no asteroid with this root_id remains + timer
-        family_left = any(a.root_id == root for a in asteroids_group)
-        family_cleared = not family_left
+        family_cleared = not self._family_left(root, asteroids_group)
 
         got_chain_bonus = False
         if family_cleared:
             start = self.chain_started_at.get(root, now)
             if (now - start) <= CHAIN_TIME_LIMIT:
                 self.score += CHAIN_BONUS
+                self.chain_bonuses += 1
                 got_chain_bonus = True
             # cleanup timer
             self.chain_started_at.pop(root, None)
+        return family_cleared, got_chain_bonus
+
+    def asteroid_destroyed(self, asteroid, asteroids_group, now):
+        self._record_kill(asteroid, now)
+        family_cleared, got_chain_bonus = self._settle_family(asteroid.root_id, asteroids_group, now)
 
         # only BIG-origin families are eligible for shield
         from_big = getattr(asteroid, "root_radius", 0) >= ASTEROID_LARGE_RADIUS
 
         return family_cleared, from_big, got_chain_bonus
 
+    def asteroid_removed(self, asteroid, asteroids_group):
+        # destroyed without scoring (shield contact): no points or bonus, but a
+        # family it finished off must still drop its chain timer
+        root = asteroid.root_id
+        if root in self.chain_started_at and not self._family_left(root, asteroids_group):
+            del self.chain_started_at[root]
+
+    def asteroids_destroyed(self, asteroids, asteroids_group, now):
+        # batch kill (bombs): points for each asteroid, then one family check per root.
+        # asteroids must already be dead. returns one
+        # (family_cleared, from_big, got_chain_bonus) per distinct root.
+        roots = {}
+        for asteroid in asteroids:
+            self._record_kill(asteroid, now)
+            roots.setdefault(asteroid.root_id, getattr(asteroid, "root_radius", 0))
+
+        results = []
+        for root, root_radius in roots.items():
+            family_cleared, got_chain_bonus = self._settle_family(root, asteroids_group, now)
+            results.append((family_cleared, root_radius >= ASTEROID_LARGE_RADIUS, got_chain_bonus))
+        return results
+
 
 class Leaderboard:
-    def __init__(self, path=HIGHSCORES_PATH):
+    # name -> best score.
+    # storage: `path` is a json snapshot, `path`.log an append-only log of
+    # submissions (one json line each). submit() appends one line instead of
+    # rewriting the file; every LEADERBOARD_COMPACT_EVERY lines the snapshot
+    # is rewritten atomically (tmp + fsync + rename) and the log truncated.
+    # loading = snapshot + log replay, a torn last line from a crash is cut off.
+    # replaying a log over a newer snapshot gives the same result, so a crash
+    # between rename and truncate is harmless too.
+    # background=True: loading and all disk writes run on a writer thread,
+    # submit() only updates memory and queues the line. whatever piles up
+    # while the disk is busy goes out as one write (+ one fsync).
+    # scores/submit()/top() wait for the initial load, close() flushes (also at exit).
+
+    def __init__(self, path=None, background=None, fsync=None):
+        # None = the constant's current value
+        path = HIGHSCORES_PATH if path is None else path
+        background = LEADERBOARD_BACKGROUND_IO if background is None else background
+        fsync = LEADERBOARD_FSYNC if fsync is None else fsync
+        if fsync not in ("always", "interval", "never"):
+            raise ValueError(f"fsync must be 'always', 'interval' or 'never', got {fsync!r}")
         self.path = path
-        self.scores = self._load()
+        self.log_path = path + ".log"
+        self.fsync = fsync
+        self._scores = {}
+        # ranking: sorted (-score, first seen, name), same order as sorting the dict
+        self._ranked = []
+        self._seen = {}
+        self._log_lines = 0
+        self._last_sync = time.monotonic()
+        self._unsynced = False
+        self.error = None
+        self.closed = False
+
+        self.loaded = threading.Event()
+        self.queue = queue.Queue()
+        if background:
+            self.thread = threading.Thread(target=self._run, name="leaderboard-writer", daemon=True)
+            self.thread.start()
+            atexit.register(self.close)
+        else:
+            self.thread = None
+            self._load()
+            self.loaded.set()
+
+    @property
+    def scores(self):
+        # name -> score, complete once the initial load is done
+        self.loaded.wait()
+        return self._scores
 
     def _load(self):
-        if not os.path.exists(self.path):
-            return {}
         try:
             with open(self.path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            snapshot = {}
+        if not isinstance(snapshot, dict):
+            snapshot = {}  # not ours / garbled, start empty
+        for name, score in snapshot.items():
+            self._apply(name, score, overwrite=True)
 
-    def save(self):
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(self.scores, f, indent=2)
+        try:
+            with open(self.log_path, "rb+") as f:
+                data = f.read()
+                end = data.rfind(b"\n") + 1
+                if end < len(data):
+                    # torn last line from a crash: cut it off, the next append
+                    # would otherwise land on the same line and be lost too
+                    f.truncate(end)
+        except OSError:
+            return
+        for line in data[:end].decode("utf-8", errors="replace").splitlines():
+            try:
+                entry = json.loads(line)
+                self._apply(entry["name"], entry["score"], entry.get("overwrite", False))
+            except (ValueError, KeyError, TypeError):
+                continue  # garbled line
+            self._log_lines += 1
 
-    def submit(self, name, score, overwrite=False):
+    def _apply(self, name, score, overwrite):
         # overwrite=True  -> same name replaces previous score
         # overwrite=False -> keep the best
-        
-        if overwrite or name not in self.scores:
-            self.scores[name] = score
-        else:
-            self.scores[name] = max(self.scores[name], score)
-        self.save()
+        old = self._scores.get(name)
+        if old is not None and not overwrite:
+            score = max(old, score)
+        if old == score:
+            return
+        seen = self._seen.setdefault(name, len(self._seen))
+        if old is not None:
+            del self._ranked[bisect.bisect_left(self._ranked, (-old, seen, name))]
+        bisect.insort(self._ranked, (-score, seen, name))
+        self._scores[name] = score
+
+    def save(self):
+        # compact: atomic snapshot, then drop the log it covers
+        self.loaded.wait()
+        self._log_lines = 0
+        self._put(("snapshot", dict(self._scores)))
+
+    def submit(self, name, score, overwrite=False):
+        self.loaded.wait()
+        self._apply(name, score, overwrite)
+        self._put(("entry", {"name": name, "score": score, "overwrite": overwrite}))
+        self._log_lines += 1
+        if self._log_lines >= LEADERBOARD_COMPACT_EVERY:
+            self.save()
 
     def top(self, n=10):
-        return sorted(self.scores.items(), key=lambda kv: kv[1], reverse=True)[:n]
+        self.loaded.wait()
+        return [(name, -neg) for neg, _, name in self._ranked[:n]]
+
+    def flush(self):
+        # block until everything submitted so far is on disk
+        if self.thread is not None:
+            self.queue.join()
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        # flush and stop the writer, safe to call more than once
+        if self.closed:
+            return
+        self.closed = True
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            atexit.unregister(self.close)
+        if self._unsynced:
+            self._sync()
+        if self.error is not None:
+            raise self.error
+
+    # disk side, writer thread (or caller when background=False)
+    def _put(self, item):
+        if self.thread is None:
+            self._write([item])
+        else:
+            self.queue.put(item)
+
+    def _run(self):
+        try:
+            self._load()
+        except Exception as exc:  # unreadable files, start empty and report on close()
+            self.error = exc
+        finally:
+            self.loaded.set()
+        while True:
+            batch = [self.queue.get()]
+            # coalesce whatever queued up meanwhile into the same write
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write([item for item in batch if item is not None])
+            except Exception as exc:  # surfaced on flush()/close()
+                self.error = exc
+            for _ in batch:
+                self.queue.task_done()
+            if None in batch:
+                return
+
+    def _write(self, items):
+        lines = []
+        for kind, data in items:
+            if kind == "entry":
+                lines.append(json.dumps(data) + "\n")
+            else:
+                # lines queued before the snapshot belong to the log it replaces
+                self._append(lines)
+                lines = []
+                self._write_snapshot(data)
+        self._append(lines)
+
+    def _append(self, lines):
+        if not lines:
+            return
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+            f.flush()
+            self._unsynced = True
+            if self.fsync == "always" or (self.fsync == "interval" and
+                                          time.monotonic() - self._last_sync >= LEADERBOARD_FSYNC_INTERVAL):
+                os.fsync(f.fileno())
+                self._synced()
+
+    def _sync(self):
+        # pending log bytes to disk ("interval" / "never" leave some behind)
+        try:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                os.fsync(f.fileno())
+        except OSError:
+            return
+        self._synced()
+
+    def _synced(self):
+        self._unsynced = False
+        self._last_sync = time.monotonic()
+
+    def _write_snapshot(self, scores):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(scores, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        with open(self.log_path, "w", encoding="utf-8"):
+            pass
+        self._synced()
@@ -1,18 +1,24 @@
 import pygame
 from circleshape import CircleShape
 from constants import SHOT_RADIUS, SCREEN_WIDTH, SCREEN_HEIGHT, DESPAWN_MARGIN, SHOT_LIFETIME
+from entitystore import KIND_SHOT
 
 class Shot(CircleShape):
+    store_kind = KIND_SHOT
+
     def __init__(self, x, y):
         super().__init__(x, y, SHOT_RADIUS)
         self.age = 0.0
-        self.prev_position = pygame.Vector2(x, y)
+        self._reset_vector("prev_position", x, y)
 
     def draw(self, screen):
         # pygame.draw.circle(surface, color, center, radius, width)
-        pygame.draw.circle(screen, "white", self.position, self.radius, 2)
+        return pygame.draw.circle(screen, "white", self.position, self.radius, 2)
 
     def update(self, dt):
+        if self._slot is not None:
+            return  # integrated and culled by EntityStore.step
+
         self.age += dt
         self.prev_position.update(self.position)
         self.position += self.velocity * dt
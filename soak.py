@@ -0,0 +1,232 @@
+import os
+# cabinets-in-a-box: no window, no audio
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import pygame
+import asteroid
+import effects
+import main as game
+from autopilot import Autopilot
+from circleshape import CircleShape
+from constants import (SCREEN_WIDTH, SCREEN_HEIGHT, SIM_DT, UI_FONT_NAME, UI_FONT_SIZE, SOAK_ROUNDS,
+                       SOAK_ROUND_MAX_TIME, SOAK_SAMPLE_EVERY, SOAK_WARMUP_ROUNDS, SOAK_MAX_MEMORY_GROWTH,
+                       SOAK_MIN_MEMORY_GROWTH_MB, SOAK_MIN_SPRITE_GROWTH, SOAK_MIN_CHAIN_GROWTH,
+                       SOAK_MAX_FRAME_GROWTH)
+from hud import Hud
+from profiler import perf_ns, percentile
+from score import Leaderboard
+
+# days of cabinet uptime in one process: autopilot rounds back to back the way
+# main runs them (init_round -> play + draw -> clear -> submit score, the name
+# prompt bypassed), sampling every SOAK_SAMPLE_EVERY rounds:
+#   traced python memory, RSS, live sprites, leftovers in the ended world's
+#   groups, ScoreManager.chain_started_at (size, and timers of families with
+#   no asteroid left, which should have been dropped), surface cache sizes,
+#   p99 tick time.
+# after SOAK_WARMUP_ROUNDS (caches and pools filling up) memory and p99 must
+# stay flat: the last third of the samples is compared to the first third.
+# exit status 1 when a check fails.
+
+
+def rss_bytes():
+    # resident set size, None where /proc is missing
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def live_sprites():
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, CircleShape))
+
+
+def cache_sizes(hud):
+    return {
+        "asteroid_frames": len(asteroid._sprite_cache),
+        "effects": len(effects._effect_cache),
+        "hud_text": len(hud.text.cache),
+        "hud_widgets": len(hud.widgets),
+    }
+
+
+def draw(screen, world, hud):
+    # the same layers main draws, without presenting
+    screen.fill((0, 0, 0))
+    game.draw_bomb_telegraphs(screen, world.player.pending_bombs)
+    game.draw_blast_flashes(screen, world.bomb_flashes)
+    hud.draw(screen, world.player, world.scorer)
+    for spr in world.drawable:
+        spr.draw(screen)
+
+
+def play_round(screen, hud, policy, max_time, render):
+    # one round, returns (world, per-tick ns)
+    world = game.init_round()
+    policy.reset()
+    ticks = []
+    max_ticks = int(max_time / SIM_DT)
+    while world.ticks < max_ticks:
+        start = perf_ns()
+        alive = world.step(SIM_DT, policy(world))
+        if render:
+            draw(screen, world, hud)
+        ticks.append(perf_ns() - start)
+        if not alive:
+            break
+    return world, ticks
+
+
+def growth(values):
+    # (median of the first third, median of the last third), None when too few samples
+    values = [v for v in values if v is not None]
+    if len(values) < 6:
+        return None
+    k = len(values) // 3
+    return statistics.median(values[:k]), statistics.median(values[-k:])
+
+
+def stale_chains(world):
+    # chain timers whose family is gone: cleared families must drop theirs
+    alive = {a.root_id for a in world.asteroids}
+    return sum(1 for root in world.scorer.chain_started_at if root not in alive)
+
+
+def check(samples):
+    # [(name, ok, message)] over the post-warmup samples
+    results = []
+    for key, label in (("traced", "traced memory"), ("rss", "rss")):
+        values = [s[key] for s in samples]
+        g = growth(values)
+        if g is None:
+            results.append((label, True, "not sampled" if all(v is None for v in values) else "not enough samples"))
+            continue
+        first, last = g
+        limit = max(first * SOAK_MAX_MEMORY_GROWTH, SOAK_MIN_MEMORY_GROWTH_MB * 2**20)
+        results.append((label, last - first <= limit,
+                        f"{first / 2**20:.1f} -> {last / 2**20:.1f} MB (limit +{limit / 2**20:.1f} MB)"))
+
+    g = growth([s["tick_p99_ms"] for s in samples])
+    if g is None:
+        results.append(("p99 tick", True, "not enough samples"))
+    else:
+        first, last = g
+        results.append(("p99 tick", last <= first * (1 + SOAK_MAX_FRAME_GROWTH),
+                        f"{first:.2f} -> {last:.2f} ms (limit +{SOAK_MAX_FRAME_GROWTH:.0%})"))
+
+    g = growth([s["live_sprites"] for s in samples])
+    if g is not None:
+        first, last = g
+        limit = max(first * SOAK_MAX_MEMORY_GROWTH, SOAK_MIN_SPRITE_GROWTH)
+        results.append(("live sprites", last - first <= limit, f"{first:.0f} -> {last:.0f} (limit +{limit:.0f})"))
+
+    g = growth([s["chains_max"] for s in samples])
+    if g is not None:
+        first, last = g
+        limit = max(first * SOAK_MAX_MEMORY_GROWTH, SOAK_MIN_CHAIN_GROWTH)
+        results.append(("chain timers", last - first <= limit, f"{first:.0f} -> {last:.0f} (limit +{limit:.0f})"))
+
+    stale = sum(s["stale_chains"] for s in samples)
+    results.append(("stale chains", stale == 0, f"{stale} timers of cleared families left"))
+
+    orphans = sum(s["orphans"] for s in samples)
+    results.append(("orphan sprites", orphans == 0, f"{orphans} left in ended worlds' groups"))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="play rounds back to back, fail on memory or frame time creep")
+    parser.add_argument("--rounds", type=int, default=SOAK_ROUNDS)
+    parser.add_argument("--max-time", type=float, default=SOAK_ROUND_MAX_TIME, help="round time cap in sec")
+    parser.add_argument("--sample-every", type=int, default=SOAK_SAMPLE_EVERY)
+    parser.add_argument("--warmup", type=int, default=SOAK_WARMUP_ROUNDS)
+    parser.add_argument("--no-render", action="store_true", help="simulation only, skip drawing")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="faster, RSS only")
+    parser.add_argument("--out", default="soak.jsonl", help="one json line per sample")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))  # display format for the sprite caches
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    hud = Hud(pygame.font.SysFont(UI_FONT_NAME, UI_FONT_SIZE))
+    if not args.no_render:
+        asteroid.prerender_frames()  # the frame cache at its full size, growth after this is a leak
+    policy = Autopilot()
+    board_dir = tempfile.TemporaryDirectory(prefix="soak-")
+    leaderboard = Leaderboard(os.path.join(board_dir.name, "highscores.json"))
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+
+    samples = []
+    ticks = []
+    orphans = 0
+    chains_max = 0
+    stale = 0
+    start = time.perf_counter()
+    with open(args.out, "w", encoding="utf-8") as out:
+        for i in range(1, args.rounds + 1):
+            world, round_ticks = play_round(screen, hud, policy, args.max_time, not args.no_render)
+            ticks.extend(round_ticks)
+            chains_max = max(chains_max, len(world.scorer.chain_started_at))
+            stale += stale_chains(world)
+            world.clear()
+            orphans += (len(world.updatable) + len(world.drawable) + len(world.asteroids) +
+                        len(world.shots) + len(world.powerups))
+            leaderboard.submit("SOAK", world.scorer.score)
+            del world
+
+            if i % args.sample_every:
+                continue
+            gc.collect()
+            ticks.sort()
+            sample = {
+                "round": i,
+                "elapsed": time.perf_counter() - start,
+                "traced": tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None,
+                "rss": rss_bytes(),
+                "live_sprites": live_sprites(),
+                "orphans": orphans,
+                "chains_max": chains_max,
+                "stale_chains": stale,
+                "caches": cache_sizes(hud),
+                "tick_p50_ms": percentile(ticks, 50) / 1e6,
+                "tick_p99_ms": percentile(ticks, 99) / 1e6,
+                "autopilot_p99_ms": policy.stats()["cost_p99_ms"],
+            }
+            out.write(json.dumps(sample) + "\n")
+            out.flush()
+            samples.append(sample)
+            traced = "-" if sample["traced"] is None else f"{sample['traced'] / 2**20:.1f}"
+            rss = "-" if sample["rss"] is None else f"{sample['rss'] / 2**20:.1f}"
+            print(f"round {i:6d}  traced {traced} MB  rss {rss} MB  sprites {sample['live_sprites']}  "
+                  f"chains {chains_max}  p99 {sample['tick_p99_ms']:.2f} ms")
+            ticks.clear()
+            orphans = 0
+            chains_max = 0
+            stale = 0
+
+    leaderboard.close()
+    board_dir.cleanup()
+    pygame.quit()
+
+    steady = [s for s in samples if s["round"] > args.warmup]
+    failed = False
+    print(f"\n{args.rounds} rounds in {time.perf_counter() - start:.0f}s, {len(steady)} samples after warmup")
+    for name, ok, message in check(steady):
+        failed |= not ok
+        print(f"  {'ok  ' if ok else 'FAIL'} {name:<15} {message}")
+    print(f"-> {args.out}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+from constants import SPATIAL_CELL_SIZE
+
+
+class SpatialGrid:
+    # uniform grid (spatial hash) for broad-phase circle queries.
+    # cells are keyed by integer cell coords in a dict, so objects that are
+    # offscreen (spawn margin, wrap overshoot from CircleShape.wrap_position)
+    # hash exactly like on-screen ones. rebuilt every tick, so wrapped objects
+    # never sit in a stale cell.
+
+    def __init__(self, cell_size=None):
+        self.cell_size = SPATIAL_CELL_SIZE if cell_size is None else cell_size
+        self.cells = {}
+        self.order = {}  # item -> insertion index, keeps brute-force iteration order
+
+    @classmethod
+    def from_sprites(cls, sprites, cell_size=None, store=None):
+        # store: read positions from its rows, not through each sprite's descriptors
+        grid = cls(cell_size)
+        if store is not None:
+            sprites = list(sprites)
+            slots = [s._slot for s in sprites]
+            for sprite, (x, y), r in zip(sprites, store.pos[slots].tolist(), store.radius[slots].tolist()):
+                grid.insert(sprite, x, y, r)
+            return grid
+        for sprite in sprites:
+            grid.insert(sprite, sprite.position.x, sprite.position.y, sprite.radius)
+        return grid
+
+    @classmethod
+    def from_segments(cls, shots, cell_size=None):
+        # swept shots: index the box around prev_position -> position
+        grid = cls(cell_size)
+        for shot in shots:
+            p0, p1, r = shot.prev_position, shot.position, shot.radius
+            grid.insert_box(shot, min(p0.x, p1.x) - r, min(p0.y, p1.y) - r,
+                            max(p0.x, p1.x) + r, max(p0.y, p1.y) + r)
+        return grid
+
+    def clear(self):
+        self.cells.clear()
+        self.order.clear()
+
+    def __len__(self):
+        return len(self.order)
+
+    def insert(self, item, x, y, r):
+        self.insert_box(item, x - r, y - r, x + r, y + r)
+
+    def insert_box(self, item, x0, y0, x1, y1):
+        # item goes into every cell its bounding box touches
+        if item not in self.order:
+            self.order[item] = len(self.order)
+        cs = self.cell_size
+        cells = self.cells
+        for cx in range(int(x0 // cs), int(x1 // cs) + 1):
+            for cy in range(int(y0 // cs), int(y1 // cs) + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [item]
+                else:
+                    bucket.append(item)
+
+    def query(self, x, y, r):
+        # candidates whose cells overlap the query box, in insertion order.
+        # broad phase only, callers still do the exact distance check.
+        cs = self.cell_size
+        cells = self.cells
+        found = set()
+        for cx in range(int((x - r) // cs), int((x + r) // cs) + 1):
+            for cy in range(int((y - r) // cs), int((y + r) // cs) + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        if len(found) > 1:
+            return sorted(found, key=self.order.__getitem__)
+        return list(found)
@@ -0,0 +1,50 @@
+from collections import OrderedDict
+import pygame
+
+
+def surface_bytes(surf):
+    return surf.get_pitch() * surf.get_height()
+
+
+class SurfaceCache:
+    # bounded LRU of pre-rendered surfaces.
+    # get(key, render) returns the cached surface or calls render() once to make it.
+    # max_bytes: also bound the pixel memory (None = entries only)
+
+    def __init__(self, max_entries, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, render):
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = render()
+        # match display format when there is one (faster blits), headless keeps raw
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            surf = surf.convert_alpha()
+        self.entries[key] = surf
+        self.bytes += surface_bytes(surf)
+        while len(self.entries) > self.max_entries or (self.max_bytes is not None and self.bytes > self.max_bytes):
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= surface_bytes(old)
+        return surf
+
+    def full(self):
+        # one more entry would evict
+        return len(self.entries) >= self.max_entries or (self.max_bytes is not None and self.bytes >= self.max_bytes)
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def __len__(self):
+        return len(self.entries)
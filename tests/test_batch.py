@@ -0,0 +1,27 @@
+import pytest
+from batch import parse_sweep
+from headless import idle_policy, run_round
+
+
+def test_values_sweep_as_a_product():
+    assert parse_sweep(["PLAYER_SPEED=100,200", "POOL_MAX_FREE=8"]) == [
+        {"PLAYER_SPEED": 100, "POOL_MAX_FREE": 8},
+        {"PLAYER_SPEED": 200, "POOL_MAX_FREE": 8},
+    ]
+
+
+def test_tuple_values_stay_whole():
+    assert parse_sweep(["SHIELD_COLOR=(1,2,3),(4,5,6)"]) == [{"SHIELD_COLOR": (1, 2, 3)}, {"SHIELD_COLOR": (4, 5, 6)}]
+    # a tuple constant takes one tuple as one value
+    assert parse_sweep(["SHIELD_COLOR=(1,2,3)"]) == [{"SHIELD_COLOR": (1, 2, 3)}]
+
+
+@pytest.mark.parametrize("item", ["PLAYER_SPEED=", "PLAYER_SPEED=fast", "NOT_A_CONSTANT=1"])
+def test_bad_assignments_raise(item):
+    with pytest.raises(ValueError):
+        parse_sweep([item])
+
+
+def test_round_defaults_follow_overrides():
+    stats = run_round(idle_policy, overrides={"HEADLESS_DT": 0.05, "HEADLESS_MAX_TIME": 1.0}, seed=1)
+    assert stats["ticks"] == 20
@@ -0,0 +1,110 @@
+import pygame
+import pytest
+import controls
+from constants import INPUT_PAD_DEADZONE
+
+
+def event(kind, **attrs):
+    return pygame.event.Event(kind, **attrs)
+
+
+def key(kind, k):
+    return event(kind, key=k)
+
+
+@pytest.fixture
+def inputs():
+    return controls.InputManager()
+
+
+@pytest.mark.parametrize("k, bit", [
+    (pygame.K_a, controls.LEFT),
+    (pygame.K_d, controls.RIGHT),
+    (pygame.K_w, controls.THRUST),
+    (pygame.K_s, controls.REVERSE),
+    (pygame.K_SPACE, controls.FIRE),
+])
+def test_default_keys(inputs, k, bit):
+    inputs.handle(key(pygame.KEYDOWN, k))
+    assert inputs.sample() == bit
+    assert inputs.sample() == bit  # held
+    inputs.handle(key(pygame.KEYUP, k))
+    assert inputs.sample() == controls.NONE
+
+
+def test_unbound_keys_are_ignored(inputs):
+    inputs.handle(key(pygame.KEYDOWN, pygame.K_q))
+    assert inputs.sample() == controls.NONE
+
+
+def test_tap_between_samples_counts_once(inputs):
+    inputs.handle(key(pygame.KEYDOWN, pygame.K_SPACE))
+    inputs.handle(key(pygame.KEYUP, pygame.K_SPACE))
+    assert inputs.sample() == controls.FIRE
+    assert inputs.sample() == controls.NONE
+
+
+def test_keys_sharing_a_bit(inputs):
+    inputs.bind(pygame.K_LEFT, controls.LEFT)
+    inputs.handle(key(pygame.KEYDOWN, pygame.K_a))
+    inputs.handle(key(pygame.KEYDOWN, pygame.K_LEFT))
+    inputs.handle(key(pygame.KEYUP, pygame.K_a))
+    assert inputs.sample() == controls.LEFT  # K_LEFT still down
+    inputs.handle(key(pygame.KEYUP, pygame.K_LEFT))
+    assert inputs.sample() == controls.NONE
+
+
+def test_unbind_releases_the_key(inputs):
+    inputs.handle(key(pygame.KEYDOWN, pygame.K_w))
+    inputs.sample()
+    inputs.unbind(pygame.K_w)
+    assert inputs.sample() == controls.NONE
+    assert inputs.keys_for(controls.THRUST) == []
+
+
+def test_pad_buttons(inputs):
+    inputs.handle(event(pygame.JOYBUTTONDOWN, button=0, instance_id=0))
+    assert inputs.sample() == controls.FIRE
+    inputs.handle(event(pygame.JOYBUTTONUP, button=0, instance_id=0))
+    assert inputs.sample() == controls.NONE
+
+
+@pytest.mark.parametrize("axis, value, bit", [
+    (0, -1.0, controls.LEFT),
+    (0, 1.0, controls.RIGHT),
+    (1, -1.0, controls.THRUST),  # stick up
+    (1, 1.0, controls.REVERSE),
+    (0, INPUT_PAD_DEADZONE / 2, controls.NONE),
+])
+def test_stick(inputs, axis, value, bit):
+    inputs.handle(event(pygame.JOYAXISMOTION, instance_id=0, axis=axis, value=value))
+    assert inputs.sample() == bit
+    inputs.handle(event(pygame.JOYAXISMOTION, instance_id=0, axis=axis, value=0.0))
+    assert inputs.sample() == controls.NONE
+
+
+def test_dpad(inputs):
+    inputs.handle(event(pygame.JOYHATMOTION, instance_id=0, hat=0, value=(-1, 1)))
+    assert inputs.sample() == controls.LEFT | controls.THRUST
+
+
+def test_deadzone_argument():
+    loose = controls.InputManager(deadzone=0.9)
+    loose.handle(event(pygame.JOYAXISMOTION, instance_id=0, axis=0, value=0.5))
+    assert loose.sample() == controls.NONE
+
+
+def test_focus_loss_drops_held_keys(inputs):
+    inputs.handle(key(pygame.KEYDOWN, pygame.K_d))
+    inputs.sample()
+    inputs.handle(event(pygame.WINDOWFOCUSLOST))
+    assert inputs.sample() == controls.NONE
+
+
+def test_press_latency_reaches_the_presented_frame(inputs):
+    inputs.handle(key(pygame.KEYDOWN, pygame.K_a))
+    pressed = inputs.press_ns
+    inputs.sample()
+    assert inputs.presented(pressed + 5_000_000) == 5_000_000
+    assert inputs.presented() is None  # reported once
+    assert list(inputs.latencies) == [5_000_000]
@@ -0,0 +1,75 @@
+import json
+import random
+import pytest
+import collisions
+from constants import SIM_DT
+from entitystore import HAVE_NUMPY
+from headless import make_random_policy
+from world import World
+
+# every collision path must play a seeded round bit-identically to the
+# plain pairwise loops
+BRUTE_FORCE = {"SPATIAL_GRID_ENABLED": False, "SHOT_KERNEL_ENABLED": False}
+MODES = {
+    "grid": {"SHOT_KERNEL_ENABLED": False},
+    "grid + kernel": {},
+    "kernel only": {"SHOT_KERNEL_MAX_PAIRS": 10**9},
+    "kernel, no grid": {"SPATIAL_GRID_ENABLED": False},
+    "entity store": {"ENTITY_STORE_ENABLED": True},
+    "no pools": {"OBJECT_POOLS_ENABLED": False},
+    "no pools, pairwise": {**BRUTE_FORCE, "OBJECT_POOLS_ENABLED": False},
+}
+
+
+def play(overrides, seed=11, ticks=1500, restore_at=None):
+    # digest per tick. overcharge, weapon boost and a bomb every 400 ticks so
+    # every collision pass runs, not only the ones the random inputs reach.
+    # restore_at: rebuild the world from a json round trip of its snapshot there
+    world = World(overrides, seed=seed)
+    policy = make_random_policy(seed, 12)
+    digests = []
+    for t in range(ticks):
+        if t % 400 == 0:
+            world.player.activate_overcharge()
+            world.player.activate_weapon_boost()
+        if t % 400 == 200:
+            world.player.pending_bombs.append({"timer": 0.0, "pos": world.player.position.copy()})
+        if t == restore_at:
+            world.restore(json.loads(json.dumps(world.snapshot())))
+        if not world.step(SIM_DT, policy(world)):
+            break
+        digests.append(world.digest())
+    world.clear()
+    return digests
+
+
+@pytest.fixture(scope="module")
+def reference():
+    # the brute-force path must not touch the numpy kernels
+    with pytest.MonkeyPatch.context() as mp:
+        for name in ("segment_circle_hits", "within_any"):
+            mp.setattr(collisions, name, None, raising=False)
+        return play(BRUTE_FORCE)
+
+
+def test_reference_plays_a_full_round(reference):
+    assert len(reference) == 1500
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_modes_match_brute_force(reference, mode):
+    if MODES[mode].get("ENTITY_STORE_ENABLED") and not HAVE_NUMPY:
+        pytest.skip("EntityStore needs numpy")
+    assert play(MODES[mode]) == reference
+
+
+def test_round_depends_only_on_its_seed(reference):
+    # the process-wide random module plays no part
+    random.seed(1234)
+    assert play(BRUTE_FORCE) == reference
+    assert play(BRUTE_FORCE, seed=12)[:100] != reference[:100]
+
+
+@pytest.mark.parametrize("restore_at", [1, 200, 700])  # 200: with a bomb pending
+def test_snapshot_restore_continues_the_same_round(reference, restore_at):
+    assert play(BRUTE_FORCE, restore_at=restore_at) == reference
@@ -0,0 +1,18 @@
+import effects
+from constants import EFFECT_ALPHA_STEP, POWERUP_BOMB_RADIUS
+
+COLOR = (255, 235, 50)
+
+
+def disc_alpha(alpha):
+    surf = effects.blast_flash(POWERUP_BOMB_RADIUS, alpha, COLOR)
+    return surf.get_at((surf.get_width() // 2, surf.get_height() // 2)).a
+
+
+def test_flash_peak_alpha_is_kept():
+    assert disc_alpha(180) == 90
+
+
+def test_flash_alpha_rounds_to_the_nearest_step():
+    for alpha in range(0, 181):
+        assert abs(disc_alpha(alpha) * 2 - alpha) <= EFFECT_ALPHA_STEP // 2 + 1, alpha
@@ -0,0 +1,48 @@
+import pygame
+import pytest
+from entitystore import HAVE_NUMPY, STORE_FIELDS
+from asteroid import Asteroid
+from constants import SCREEN_WIDTH
+from world import World
+
+pytestmark = pytest.mark.skipif(not HAVE_NUMPY, reason="EntityStore needs numpy")
+
+
+@pytest.fixture
+def world():
+    w = World({"ENTITY_STORE_ENABLED": True}, seed=1)
+    yield w
+    w.clear()
+
+
+def test_in_place_writes_reach_the_row(world):
+    a = Asteroid(100, 100, 40)
+    a.position.x = 5
+    a.position[1] = 6
+    assert tuple(world.store.pos[a._slot]) == (5, 6)
+    a.velocity.update(3, 4)
+    a.velocity.scale_to_length(10)
+    assert tuple(world.store.vel[a._slot]) == (6, 8)
+    p = a.position
+    p += pygame.Vector2(1, 1)
+    assert a.position == (6, 7)
+
+
+def test_wrap_position_on_a_store_sprite(world):
+    a = Asteroid(-500, 10, 40)
+    a.wrap_position()
+    assert a.position.x == SCREEN_WIDTH + 40
+
+
+def test_killed_sprite_keeps_its_values(world):
+    a = Asteroid(100, 100, 40)
+    a.position.x = 7
+    a.kill()
+    assert a._slot is None and a.position == (7, 100)
+
+
+def test_plain_world_drops_the_descriptors(world):
+    assert Asteroid.__dict__.get("position") is STORE_FIELDS["position"]
+    plain = World(seed=1)
+    assert "position" not in Asteroid.__dict__
+    plain.clear()
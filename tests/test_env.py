@@ -0,0 +1,25 @@
+import pytest
+from constants import ENV_K_NEAREST
+from env import AsteroidsEnv, Observation, observation_size
+from entitystore import HAVE_NUMPY, np
+from world import World
+
+pytestmark = pytest.mark.skipif(not HAVE_NUMPY, reason="env needs numpy")
+
+
+def test_observation_default_k():
+    observation = Observation(np.zeros(observation_size(), dtype=np.float32))
+    assert observation.k == ENV_K_NEAREST
+    assert observation.rows.shape[0] == ENV_K_NEAREST
+    world = World({"ENTITY_STORE_ENABLED": True}, seed=1)
+    observation.fill(world)
+    world.clear()
+
+
+def test_settings_follow_overrides():
+    env = AsteroidsEnv(seed=1, overrides={"ENV_K_NEAREST": 3, "ENV_FRAME_SKIP": 2})
+    assert env.obs.shape == (observation_size(3),)
+    env.reset()
+    env.step(0)
+    assert env.info["ticks"] == 2
+    env.close()
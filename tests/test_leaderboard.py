@@ -0,0 +1,59 @@
+import json
+import pytest
+from score import Leaderboard
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "highscores.json")
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_submit_survives_reload(path, background):
+    board = Leaderboard(path, background=background)
+    board.submit("A", 10)
+    board.submit("B", 30)
+    board.submit("A", 5)  # keeps the best
+    board.close()
+    assert Leaderboard(path, background=False).top() == [("B", 30), ("A", 10)]
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_torn_log_tail_is_cut_before_appending(path, background):
+    board = Leaderboard(path, background=False)
+    board.submit("A", 10)
+    board.close()
+    # crash halfway through writing the next line
+    with open(path + ".log", "a", encoding="utf-8") as f:
+        f.write('{"name": "B", "sco')
+
+    board = Leaderboard(path, background=background)
+    assert board.top() == [("A", 10)]
+    board.submit("C", 99)
+    board.close()
+
+    assert Leaderboard(path, background=False).top() == [("C", 99), ("A", 10)]
+    with open(path + ".log", "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["A", "C"]
+
+
+def test_garbled_snapshot_and_lines_are_skipped(path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[1, 2]")
+    with open(path + ".log", "w", encoding="utf-8") as f:
+        f.write('not json\n{"name": "A", "score": 7}\n')
+    assert Leaderboard(path, background=False).top() == [("A", 7)]
+
+
+def test_compaction_replaces_log_with_snapshot(path):
+    board = Leaderboard(path, background=False)
+    board.submit("A", 10)
+    board.submit("B", 20, overwrite=True)
+    board.save()
+    board.close()
+    with open(path, "r", encoding="utf-8") as f:
+        assert json.load(f) == {"A": 10, "B": 20}
+    with open(path + ".log", "r", encoding="utf-8") as f:
+        assert f.read() == ""
+    assert Leaderboard(path, background=False).top() == [("B", 20), ("A", 10)]
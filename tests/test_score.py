@@ -0,0 +1,50 @@
+import pytest
+import world as world_mod
+from asteroid import Asteroid
+from constants import ASTEROID_MIN_RADIUS
+from world import World
+
+
+@pytest.fixture
+def world():
+    w = World(seed=1)
+    for a in list(w.asteroids):
+        a.kill()
+    yield w
+    w.clear()
+
+
+def family_of_two(world):
+    # two smallest siblings next to the ship, one already shot (chain timer running)
+    p = world.player.position
+    first = Asteroid(p.x + 300, p.y, ASTEROID_MIN_RADIUS)
+    last = Asteroid(p.x, p.y, ASTEROID_MIN_RADIUS, root_id=first.root_id, root_radius=first.root_radius)
+    first.split()
+    world.scorer.asteroid_destroyed(first, world.asteroids, 1.0)
+    assert first.root_id in world.scorer.chain_started_at
+    return last
+
+
+@pytest.mark.parametrize("use_grid", [False, True])
+def test_shield_kill_that_clears_a_family_drops_its_chain_timer(world, use_grid):
+    last = family_of_two(world)
+    player = world.player
+    player.add_shield(1)
+    player.shield_iframes = 0
+    grid = world_mod.SpatialGrid.from_sprites(world.asteroids) if use_grid else None
+    score = world.scorer.score
+    assert world_mod.collide_player_asteroids(player, world.asteroids, world.scorer, grid, 2.0)
+    assert not last.alive()
+    assert world.scorer.chain_started_at == {}
+    assert world.scorer.score == score  # shield kills still score nothing
+
+
+def test_shield_kill_keeps_the_timer_while_the_family_lives(world):
+    last = family_of_two(world)
+    p = world.player.position
+    Asteroid(p.x - 300, p.y, ASTEROID_MIN_RADIUS, root_id=last.root_id, root_radius=last.root_radius)
+    world.player.add_shield(1)
+    world.player.shield_iframes = 0
+    world_mod.collide_player_asteroids(world.player, world.asteroids, world.scorer, None, 2.0)
+    assert not last.alive()
+    assert last.root_id in world.scorer.chain_started_at
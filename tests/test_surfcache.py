@@ -0,0 +1,25 @@
+import pygame
+from surfcache import SurfaceCache, surface_bytes
+
+
+def square(size):
+    return lambda: pygame.Surface((size, size), pygame.SRCALPHA)
+
+
+def test_byte_bound_evicts_oldest():
+    one = surface_bytes(square(32)())
+    cache = SurfaceCache(100, max_bytes=3 * one)
+    for key in range(5):
+        cache.get(key, square(32))
+    assert list(cache.entries) == [2, 3, 4]
+    assert cache.bytes == 3 * one
+    assert cache.full()
+
+
+def test_entry_bound_still_applies():
+    cache = SurfaceCache(2)
+    for key in range(4):
+        cache.get(key, square(8))
+    assert list(cache.entries) == [2, 3]
+    cache.clear()
+    assert cache.bytes == 0 and not cache.full()
@@ -0,0 +1,80 @@
+import os
+import sys
+import constants
+
+# constant overrides for balancing runs.
+# game modules bind constants at import (from constants import ...), so an
+# override has to be written into every game module that holds the name.
+# activate() swaps one override set for another and remembers the defaults,
+# so each World can carry its own values without leaking into the next one.
+# derived constants (ASTEROID_MAX_RADIUS, ...) are not recomputed, override them too.
+# defaults that come from constants are None in the signatures and read at
+# call time (run_round, SpatialGrid, Pool, Leaderboard, InputManager, ...), so
+# overrides reach them. what is built once at import or at startup keeps the
+# values it saw then: surface cache sizes, the autopilot time budget, and the
+# display / hud / profiler / replay writer settings main reads before a round.
+
+_GAME_DIR = os.path.dirname(os.path.abspath(constants.__file__))
+_defaults = {}      # name -> original value
+_active = None      # currently applied overrides dict (or None)
+_is_game = {}       # module name -> lives next to constants.py
+
+
+def _game_modules():
+    for name, module in list(sys.modules.items()):
+        mine = _is_game.get(name)
+        if mine is None:
+            path = getattr(module, "__file__", None)
+            mine = _is_game[name] = bool(path) and os.path.dirname(os.path.abspath(path)) == _GAME_DIR
+        if mine:
+            yield module
+
+
+def _same(a, b):
+    # same names bound to the very same values, swapping would change nothing
+    if not a or not b:
+        return not a and not b
+    return a.keys() == b.keys() and all(a[name] is b[name] for name in a)
+
+
+def validate(overrides):
+    unknown = [name for name in overrides if not hasattr(constants, name) or not name.isupper()]
+    if unknown:
+        raise ValueError(f"unknown constant(s): {', '.join(sorted(unknown))}")
+
+
+def _write(name, value):
+    original = _defaults.get(name, getattr(constants, name))
+    for module in _game_modules():
+        if getattr(module, name, None) is original or module is constants:
+            setattr(module, name, value)
+    # keep the original so later writes still find the modules holding it
+    _defaults.setdefault(name, original)
+
+
+def _restore(name):
+    original = _defaults[name]
+    current = getattr(constants, name)
+    for module in _game_modules():
+        if getattr(module, name, None) is current or module is constants:
+            setattr(module, name, original)
+
+
+def activate(overrides):
+    # make `overrides` the live constant set (None = defaults), cheap if already active
+    global _active
+    if overrides is _active or _same(overrides, _active):
+        _active = overrides
+        return
+    if _active:
+        for name in _active:
+            _restore(name)
+    if overrides:
+        validate(overrides)
+        for name, value in overrides.items():
+            _write(name, value)
+    _active = overrides
+
+
+def active():
+    return _active
@@ -0,0 +1,442 @@
+import hashlib
+import random
+import struct
+import pygame
+from constants import *
+from player import Player
+from asteroid import Asteroid, reserve_ids
+from asteroidfield import AsteroidField
+from shot import Shot
+from score import ScoreManager
+from powerup import PowerUp, PowerUpSpawner
+from spatial import SpatialGrid
+from families import FamilyIndex
+from entitystore import EntityStore, HAVE_NUMPY
+from pool import Pool
+import collisions
+import controls
+import tuning
+
+_bound = None  # world whose groups the class-level containers currently point at
+
+
+class World:
+    # one round of simulation state, no display needed.
+    # step() advances everything by dt and returns False once the player is dead.
+    # overrides: {CONSTANT_NAME: value} live only while this world is bound.
+    # several worlds can share a process, each step() rebinds its own
+    # containers/store/overrides/rng first.
+    # seed: all randomness of the round comes from one random.Random(seed),
+    # so the same seed + input masks + dt replays bit-identically.
+
+    def __init__(self, overrides=None, seed=None):
+        self.overrides = dict(overrides) if overrides else None
+        tuning.activate(self.overrides)
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng = random.Random(self.seed)
+        self.families = FamilyIndex()
+
+        # groups
+        self.updatable = pygame.sprite.Group()
+        self.drawable = pygame.sprite.Group()
+        self.asteroids = pygame.sprite.Group()
+        self.shots = pygame.sprite.Group()
+        self.powerups = pygame.sprite.Group()
+
+        # optional array-backed asteroids/shots
+        self.store = None
+        if ENTITY_STORE_ENABLED and HAVE_NUMPY:
+            self.store = EntityStore()
+
+        # recycled asteroids/shots
+        self.asteroid_pool = Pool() if OBJECT_POOLS_ENABLED else None
+        self.shot_pool = Pool() if OBJECT_POOLS_ENABLED else None
+
+        self.bind()
+
+        # instances
+        self.player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        self.field = AsteroidField()
+        self.spawner = PowerUpSpawner(self.powerups, player_ref=self.player)
+
+        # score for this round
+        self.scorer = ScoreManager(self.families)
+
+        self.bomb_flashes = []
+        self.time = 0.0
+        self.ticks = 0
+        self.running = True
+        self.profiler = None  # optional FrameProfiler, step() laps its phases
+
+    def bind(self):
+        # containers: new sprites join this world's groups
+        global _bound
+        _bound = self
+        tuning.activate(self.overrides)
+        Player.containers = (self.drawable,)  # updated by step() with the tick's input
+        Asteroid.containers = (self.asteroids, self.updatable, self.drawable)
+        AsteroidField.containers = (self.updatable,)
+        Shot.containers = (self.shots, self.updatable, self.drawable)
+        PowerUp.containers = (self.powerups, self.updatable, self.drawable)
+        PowerUpSpawner.containers = (self.updatable,)
+        Asteroid.store = self.store
+        Shot.store = self.store
+        if self.store is not None:
+            EntityStore.install(Asteroid, Shot)
+        else:
+            EntityStore.uninstall(Asteroid, Shot)
+        Asteroid.pool = self.asteroid_pool
+        Shot.pool = self.shot_pool
+        Asteroid.rng = self.rng
+        Asteroid.families = self.families
+        AsteroidField.rng = self.rng
+        PowerUpSpawner.rng = self.rng
+
+    def step(self, dt, input_mask=controls.NONE):
+        # input_mask: controls bitmask for this tick
+        if _bound is not self:
+            self.bind()
+        player, asteroids, scorer = self.player, self.asteroids, self.scorer
+        now = self.time  # chain timing clock
+        prof = self.profiler
+        # sprites killed last tick are safe to hand out again
+        if self.asteroid_pool is not None:
+            self.asteroid_pool.recycle()
+            self.shot_pool.recycle()
+        if prof is not None:
+            prof.lap("input")
+
+        # update
+        if self.store is not None:
+            self.store.step(dt)  # asteroids + shots in one vectorized pass
+        # player first, like it always was in the group; shots it fires
+        # now start moving next tick
+        sprites = self.updatable.sprites()
+        player.update(dt, input_mask)
+        for spr in sprites:
+            spr.update(dt)
+        if prof is not None:
+            prof.lap("update")
+        # broad phase for this tick, positions are final after update
+        grid = SpatialGrid.from_sprites(asteroids, store=self.store) if SPATIAL_GRID_ENABLED else None
+        if prof is not None:
+            prof.lap("broadphase")
+        handle_powerup_pickups(self.powerups, player, asteroids, scorer)
+        if prof is not None:
+            prof.lap("pickups")
+        update_pending_bombs(dt, player, asteroids, scorer, self.bomb_flashes, grid, now, self.store)
+        for flash in list(self.bomb_flashes):
+            flash["timer"] -= dt
+            if flash["timer"] <= 0:
+                self.bomb_flashes.remove(flash)
+        if prof is not None:
+            prof.lap("bombs")
+
+        # collisions: player vs asteroids -> end round (unless overcharged)
+        self.running = collide_player_asteroids(player, asteroids, scorer, grid, now)
+        if prof is not None:
+            prof.lap("player_hits")
+
+        # collisions: shots vs asteroids -> split + score + shields on clear
+        if self.running:
+            # the kernel tests every pair: faster than the grid for small A*S, slower past it
+            use_kernel = SHOT_KERNEL_ENABLED and len(asteroids) * len(self.shots) <= SHOT_KERNEL_MAX_PAIRS
+            collide_shots_asteroids(player, asteroids, self.shots, scorer, now, use_grid=SPATIAL_GRID_ENABLED,
+                                    use_kernel=use_kernel, store=self.store)
+        if prof is not None:
+            prof.lap("shot_hits")
+
+        self.time += dt
+        self.ticks += 1
+        return self.running
+
+    def pool_stats(self):
+        # {"asteroids": {...}, "shots": {...}}, empty when pooling is off
+        if self.asteroid_pool is None:
+            return {}
+        return {"asteroids": self.asteroid_pool.stats(), "shots": self.shot_pool.stats()}
+
+    def digest(self):
+        # hash of the simulation state, equal digests = identical rounds
+        h = hashlib.sha1()
+        pack = struct.pack
+        p = self.player
+        h.update(pack("<qqd", self.ticks, self.scorer.score, self.time))
+        h.update(pack("<5d", p.position.x, p.position.y, p.velocity.x, p.velocity.y, p.rotation))
+        h.update(pack("<q4d", p.shield_charges, p.weapon_boost_timer, p.control_boost_timer,
+                      p.overcharge_timer, p.shoot_timer))
+        for a in self.asteroids:
+            h.update(pack("<6d", a.position.x, a.position.y, a.velocity.x, a.velocity.y, a.radius, a.rotation))
+        for s in self.shots:
+            h.update(pack("<2d", s.position.x, s.position.y))
+        for pw in self.powerups:
+            h.update(pw.kind.encode() + pack("<3d", pw.position.x, pw.position.y, pw.ttl))
+        return h.hexdigest()
+
+    # keyframes: plain json-able dicts, no pygame objects
+    def snapshot(self):
+        p = self.player
+        entities = []
+        for spr in [p, *self.updatable]:
+            if isinstance(spr, Player):
+                entities.append({
+                    "type": "player", "pos": tuple(spr.position), "vel": tuple(spr.velocity),
+                    "rotation": spr.rotation, "shoot_timer": spr.shoot_timer,
+                    "shield_charges": spr.shield_charges, "shield_iframes": spr.shield_iframes,
+                    "weapon": spr.weapon_boost_timer, "control": spr.control_boost_timer,
+                    "overcharge": spr.overcharge_timer,
+                    "bombs": [{"timer": b["timer"], "pos": tuple(b["pos"])} for b in spr.pending_bombs],
+                })
+            elif isinstance(spr, Asteroid):
+                entities.append({
+                    "type": "asteroid", "pos": tuple(spr.position), "vel": tuple(spr.velocity),
+                    "radius": spr.radius, "id": spr.id, "root_id": spr.root_id,
+                    "root_radius": spr.root_radius, "parent_id": spr.parent_id, "branch_id": spr.branch_id,
+                    "entered": spr._entered_screen, "rotation": spr.rotation, "spin": spr.spin,
+                    "shape": spr.shape,
+                })
+            elif isinstance(spr, Shot):
+                entities.append({
+                    "type": "shot", "pos": tuple(spr.position), "prev": tuple(spr.prev_position),
+                    "vel": tuple(spr.velocity), "age": spr.age,
+                })
+            elif isinstance(spr, PowerUp):
+                entities.append({"type": "powerup", "pos": tuple(spr.position), "kind": spr.kind, "ttl": spr.ttl})
+            elif isinstance(spr, AsteroidField):
+                entities.append({"type": "field", "spawn_timer": spr.spawn_timer})
+            elif isinstance(spr, PowerUpSpawner):
+                entities.append({"type": "spawner", "timer": spr.timer})
+        return {
+            "ticks": self.ticks, "time": self.time, "running": self.running,
+            "rng": self.rng.getstate(),
+            "score": self.scorer.score, "chains": list(self.scorer.chain_started_at.items()),
+            "kills": dict(self.scorer.kills), "chain_bonuses": self.scorer.chain_bonuses,
+            "flashes": [{"timer": f["timer"], "pos": tuple(f["pos"])} for f in self.bomb_flashes],
+            "entities": entities,
+        }
+
+    def restore(self, state):
+        # rebuild sprites in their recorded update order (group order drives collisions),
+        # then put the rng back since constructors draw from it
+        self.clear()
+        self.bind()
+        for e in state["entities"]:
+            kind = e["type"]
+            if kind == "player":
+                p = Player(*e["pos"])
+                p.velocity = pygame.Vector2(e["vel"])
+                p.rotation = e["rotation"]
+                p.shoot_timer = e["shoot_timer"]
+                p.shield_charges = e["shield_charges"]
+                p.shield_iframes = e["shield_iframes"]
+                p.weapon_boost_timer = e["weapon"]
+                p.control_boost_timer = e["control"]
+                p.overcharge_timer = e["overcharge"]
+                p.pending_bombs = [{"timer": b["timer"], "pos": pygame.Vector2(b["pos"])} for b in e["bombs"]]
+                self.player = p
+            elif kind == "asteroid":
+                a = Asteroid(*e["pos"], e["radius"], root_id=e["root_id"], root_radius=e["root_radius"],
+                             parent_id=e["parent_id"], branch_id=e["branch_id"])
+                a.id = e["id"]
+                a.velocity = pygame.Vector2(e["vel"])
+                a._entered_screen = e["entered"]
+                a.rotation = e["rotation"]
+                a.spin = e["spin"]
+                a.shape = e["shape"]
+            elif kind == "shot":
+                s = Shot(*e["pos"])
+                s.prev_position = pygame.Vector2(e["prev"])
+                s.velocity = pygame.Vector2(e["vel"])
+                s.age = e["age"]
+            elif kind == "powerup":
+                pw = PowerUp(*e["pos"], e["kind"])
+                pw.ttl = e["ttl"]
+            elif kind == "field":
+                self.field = AsteroidField()
+                self.field.spawn_timer = e["spawn_timer"]
+            elif kind == "spawner":
+                self.spawner = PowerUpSpawner(self.powerups, player_ref=self.player)
+                self.spawner.timer = e["timer"]
+
+        reserve_ids(max((e["id"] for e in state["entities"] if e["type"] == "asteroid"), default=0))
+        version, internal, gauss = state["rng"]
+        self.rng.setstate((version, tuple(internal), gauss))
+        self.ticks = state["ticks"]
+        self.time = state["time"]
+        self.running = state["running"]
+        self.scorer.score = state["score"]
+        self.scorer.chain_started_at = dict((root, t) for root, t in state["chains"])
+        self.scorer.kills = dict(state["kills"])
+        self.scorer.chain_bonuses = state["chain_bonuses"]
+        # families were rebuilt by the Asteroid constructors above
+        self.bomb_flashes = [{"timer": f["timer"], "pos": pygame.Vector2(f["pos"])} for f in state["flashes"]]
+
+    def clear(self):
+        # round end - stop all spawners/objects
+        for spr in list(self.updatable):
+            spr.kill()
+        self.player.kill()
+        self.shots.empty()
+
+
+def segment_hits_circle(p0, p1, center, radius_sum_sq):
+    # return True if segment (p0→p1) intersects a circle of given squared radius
+    v = p1 - p0
+    w = center - p0
+    v_len2 = v.x * v.x + v.y * v.y
+    if v_len2 == 0:
+        return (w.x * w.x + w.y * w.y) <= radius_sum_sq
+    t = max(0.0, min(1.0, (w.x * v.x + w.y * v.y) / v_len2))
+    closest = p0 + v * t
+    d = center - closest
+    return (d.x * d.x + d.y * d.y) <= radius_sum_sq
+
+def bomb_victims(asteroids, centers, grid=None, store=None):
+    # every live asteroid inside any of the blasts, once each, in group order
+    r = POWERUP_BOMB_RADIUS
+    blast_r2 = r * r
+    if grid is not None:
+        found = set()
+        for c in centers:
+            found.update(grid.query(c.x, c.y, r))
+        candidates = sorted(found, key=grid.order.__getitem__)
+    elif HAVE_NUMPY and SHOT_KERNEL_ENABLED:
+        # one vectorized radius query over all asteroids and blasts
+        rocks = list(asteroids)
+        points, _ = collisions.gather_circles(rocks, store)
+        inside = collisions.within_any(points, collisions.np.array([tuple(c) for c in centers]), r)
+        return [rocks[i] for i in collisions.np.flatnonzero(inside)]
+    else:
+        candidates = list(asteroids)
+    return [a for a in candidates
+            if a.alive() and any((a.position - c).length_squared() <= blast_r2 for c in centers)]
+
+def resolve_bombs(player, asteroids, scorer, centers, grid=None, now=0.0, store=None):
+    # all blasts of this tick as one batch: query, bulk kill, one scoring pass
+    victims = bomb_victims(asteroids, centers, grid, store)
+    for asteroid in victims:
+        asteroid.kill()  # gone, no splits
+    for family_cleared, from_big, _ in scorer.asteroids_destroyed(victims, asteroids, now):
+        if family_cleared and from_big:
+            player.add_shield(1)
+
+def apply_bomb(player, asteroids, scorer, center=None, grid=None, now=0.0, store=None):
+    center = center if center is not None else player.position
+    resolve_bombs(player, asteroids, scorer, [center], grid, now, store)
+
+def handle_powerup_pickups(powerups, player, asteroids, scorer):
+    for powerup in list(powerups):
+        delta = powerup.position - player.position
+        if delta.length_squared() <= (powerup.radius + player.radius) ** 2:
+            kind = powerup.kind
+            powerup.kill()
+            if kind == "bomb":
+                # delayed bomb: show ring, timed boom
+                player.pending_bombs.append({"timer": 0.5, "pos": player.position.copy()})
+            elif kind == "weapon":
+                # faster fire rate
+                player.activate_weapon_boost()
+            elif kind == "control":
+                # no drift
+                player.activate_control_boost()
+            elif kind == "overcharge":
+                # shield overdrive
+                player.activate_overcharge()
+
+def update_pending_bombs(dt, player, asteroids, scorer, flashes, grid=None, now=0.0, store=None):
+    # bombs going off on the same tick are merged into one pass
+    detonated = []
+    for bomb in list(player.pending_bombs):
+        bomb["timer"] -= dt
+        if bomb["timer"] <= 0:
+            detonated.append(bomb["pos"])
+            player.pending_bombs.remove(bomb)
+            flashes.append({"pos": bomb["pos"], "timer": 0.2})
+    if detonated:
+        resolve_bombs(player, asteroids, scorer, detonated, grid, now, store)
+
+def collide_player_asteroids(player, asteroids, scorer, grid=None, now=0.0):
+    # returns False when the hull got hit (round over)
+    if grid is not None:
+        # widest reach the player can have this tick
+        reach = max(player.radius, player.shield_radius())
+        if player.is_overcharged():
+            reach = max(reach, player.overcharge_radius())
+        candidates = grid.query(player.position.x, player.position.y, reach)
+    else:
+        candidates = list(asteroids)
+
+    for asteroid in candidates:
+        if not asteroid.alive():
+            continue
+        # distance check using shield radius when active
+        delta = player.position - asteroid.position
+        dist2 = delta.length_squared()
+
+        # overcharge: smash asteroids, slow down a bit each hit
+        if player.is_overcharged():
+            hit = dist2 <= (player.overcharge_radius() + asteroid.radius) ** 2
+            if hit:
+                asteroid.split()
+                player.overcharge_hit_slow()
+                family_cleared, from_big, _ = scorer.asteroid_destroyed(asteroid, asteroids, now)
+                if family_cleared and from_big:
+                    player.add_shield(1)
+                continue
+
+        # 1) shield contact, only if shield is ready
+        if player.has_shield() and player.shield_iframes <= 0:
+            sr = player.shield_radius()
+            if dist2 <= (sr + asteroid.radius) ** 2:
+                if player.consume_shield():
+                    player.shield_iframes = 0.25  # about 15 frames @ 60fps
+                    asteroid.split()
+                    scorer.asteroid_removed(asteroid, asteroids)
+                    continue  # handled -> next asteroid
+
+        # 2) hull contact (no shield)
+        if dist2 <= (player.radius + asteroid.radius) ** 2:
+            return False
+    return True
+
+def collide_shots_asteroids(player, asteroids, shots, scorer, now=0.0, use_grid=True, use_kernel=False, store=None):
+    # first shot (in group order) that hits an asteroid consumes itself and splits it,
+    # each asteroid is split at most once per frame.
+    if use_kernel and HAVE_NUMPY:
+        # all pairs in one numpy pass, then apply hits in the same order as the loops below
+        rocks = list(asteroids)
+        bullets = list(shots)
+        p0, p1, shot_r = collisions.gather_segments(bullets, store)
+        centers, radii = collisions.gather_circles(rocks, store)
+        a_idx, s_idx = collisions.segment_circle_hits(p0, p1, shot_r, centers, radii)
+        for a, s in collisions.first_hits(a_idx, s_idx):
+            hit = rocks[a]
+            hit.split()
+            bullets[s].kill()
+
+            family_cleared, from_big, _ = scorer.asteroid_destroyed(hit, asteroids, now)
+            if family_cleared and from_big:
+                player.add_shield(1)
+        return
+
+    # the grid indexes the shots' swept segments, asteroids are walked in group order
+    # so fragments spawned earlier this frame (overcharge/shield) are still checked.
+    grid = SpatialGrid.from_segments(shots) if use_grid else None
+    for asteroid in list(asteroids):
+        if grid is not None:
+            candidates = grid.query(asteroid.position.x, asteroid.position.y, asteroid.radius)
+        else:
+            candidates = list(shots)
+        for shot in candidates:
+            if not shot.alive():
+                continue
+            r_sum = asteroid.radius + shot.radius
+            if segment_hits_circle(shot.prev_position, shot.position, asteroid.position, r_sum * r_sum):
+                hit = asteroid
+                asteroid.split()
+                shot.kill()
+
+                family_cleared, from_big, _ = scorer.asteroid_destroyed(hit, asteroids, now)
+                if family_cleared and from_big:
+                    player.add_shield(1)
+                break